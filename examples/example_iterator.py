@@ -1,11 +1,12 @@
 
 import os
+import sys
 import tempfile
 import zipfile
 from zipnavigator import ZipNavigator
 
 def make_sample_zip(path: str) -> None:
-    with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED) as z:
+    with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_STORED) as z:
         # CSV nella sottocartella "payload/"
         z.writestr("payload/data1.csv", "a,b,c\n1,2,3\n")
         z.writestr("payload/data2.csv", "x,y,z\n4,5,6\n")
@@ -20,11 +21,9 @@ def main():
 
         # Usa SEMPRE il context manager per evitare handle aperti su Windows
         with ZipNavigator(zpath) as nav:
-            # Diagnostica: mostra root e contenuto ricorsivo
+            # Diagnostica: mostra solo la root (la scansione ricorsiva serve solo in caso di errore)
             print("PWD:", nav.pwd())
             print("Root:", nav.ls())
-            all_entries = nav.ls(recursive=True)
-            print("All entries:", all_entries)
 
             # Imposta la base in 'payload/' per limitare la vista ai soli CSV
             nav.cd("payload/")
@@ -49,13 +48,15 @@ def main():
                 print("Initialize failed:", e)
                 print("TIP: verifica PWD, ls(recursive=True) e il filtro 'extensions'.")
                 print("PWD was:", nav.pwd())
-                print("Entries here:", nav.ls(recursive=True))
+                print("Entries here (first 20):", nav.ls(recursive=True)[:20])
                 return
 
-            # Consuma i batch
+            # Consuma i batch: prefisso e stampa fuori dal ciclo (l'output si accumula in lines)
+            prefix_len = len(os.path.join(td, "batch")) + 1
+            lines = []
             for batch in nav:
-                rels = [os.path.relpath(p, os.path.join(td, "batch")) for p in batch]
-                print("Batch:", rels)
+                lines.append(f"Batch: {[p[prefix_len:].replace(os.sep, '/') for p in batch]}\n")
+            sys.stdout.write("".join(lines))
 
             st = nav.iterator_status()
             print("Final status:", st)
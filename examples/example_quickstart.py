@@ -20,5 +20,7 @@ with ZipNavigator("bundle.zip") as nav:
         batch_size=5,
         extensions=[".csv"],
     )
-    for batch in nav:
+    # collect output and print once, outside the extraction loop
+    batches = [batch for batch in nav]
+    for batch in batches:
         print("Extracted batch:", batch)
@@ -1,25 +1,28 @@
 # examples/example_resume.py
 import os
+import sys
 import tempfile
 import zipfile
 from zipnavigator import ZipNavigator
 
 def make_sample_zip(path: str) -> None:
     # Always use a context manager when writing the zip
-    with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED) as z:
+    with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_STORED) as z:
         z.writestr("data/a.txt", "A\n")
         z.writestr("data/b.txt", "B\n")
         z.writestr("data/c.txt", "C\n")
         z.writestr("docs/readme.md", "# readme\n")
 
-def _rel(out_root: str, subdir: str, abs_path: str) -> str:
-    return os.path.relpath(abs_path, os.path.join(out_root, subdir)).replace(os.sep, "/")
+def _rel(prefix_len: int, abs_path: str) -> str:
+    return abs_path[prefix_len:].replace(os.sep, "/")
 
 def main():
     with tempfile.TemporaryDirectory() as td:
         zpath = os.path.join(td, "dataset.zip")
         extract_subdir = "extracted_zip"
         make_sample_zip(zpath)  # zip is fully closed here
+        # extracted paths all start with "<td>/<extract_subdir>/"
+        prefix_len = len(os.path.join(td, extract_subdir)) + 1
 
         # --- Session 1: initialize and extract a first batch ---
         with ZipNavigator(zpath) as nav:
@@ -37,7 +40,7 @@ def main():
                 validate_crc=False,
             )
             first_batch = next(nav)
-            print("First batch:", [_rel(td, extract_subdir, p) for p in first_batch])
+            print("First batch:", [_rel(prefix_len, p) for p in first_batch])
 
             st = nav.iterator_status()
             print("State file:", st["state_file"])
@@ -47,8 +50,9 @@ def main():
         # --- Session 2: resume and finish ---
         with ZipNavigator(zpath) as nav2:
             nav2.resume_iterator(output_dir=td, extract_subdir=extract_subdir)
-            for batch in nav2:
-                print("Resumed batch:", [_rel(td, extract_subdir, p) for p in batch])
+            # collect output and print once, outside the extraction loop
+            lines = [f"Resumed batch: {[_rel(prefix_len, p) for p in batch]}\n" for batch in nav2]
+            sys.stdout.write("".join(lines))
             print("Final status:", nav2.iterator_status())
 
 if __name__ == "__main__":
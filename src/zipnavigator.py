@@ -12,13 +12,20 @@ Robustness:
 - on_error: "skip" (default) | "abort"
 - max_retries: per-file retry attempts (default 1)
 - validate_crc: optional; if True, manual extraction with integrity verification
+- workers: optional thread pool to extract the members of a batch in parallel
+- output_dir=None: in-memory mode, batches are (arcname, bytes) pairs and nothing is written
+- extract_format="tar": each batch is written as one .tar file instead of one file per member
 - Disk space preflight per batch
 - Persistent failure log (state["failed"])
+- State = JSON header written at init + append-only per-batch log (cursor, new failures);
+  the shuffled order is a packed index file into the archive's sorted name table
 """
 
 from __future__ import annotations
-import os, json, shutil, random, posixpath
-from typing import Iterable, Iterator, List, Optional, Dict, Any, Set, Tuple
+import os, io, sys, time, array, bisect, hashlib, json, mmap, shutil, random, posixpath, struct, tarfile, threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
+from typing import IO, Iterable, Iterator, List, Optional, Dict, Any, Set, Tuple
 import zipfile
 import zlib
 
@@ -30,11 +37,60 @@ def _is_safe_member(name: str) -> bool:
         return False
     if len(name) >= 2 and name[1] == ":" and name[0].isalpha():
         return False
+    if ".." not in name:
+        return True  # nothing normpath could resolve upwards (the common case)
     norm = posixpath.normpath(name)
     if norm.startswith("../") or norm == "..":
         return False
     return True
 
+@lru_cache(maxsize=4096)
+def _normalize_path(cwd: str, path: str) -> str:
+    """
+    Slow path of ZipNavigator._resolve, memoized on (cwd, path): the result depends on nothing
+    else, and repeated queries from a loop skip the join/normpath work.
+    """
+    path = path.replace("\\", "/")
+    is_dir_hint = path.endswith("/")
+
+    # Absolute → strip leading '/', else join to cwd
+    if path.startswith("/"):
+        rel = path[1:]
+    else:
+        rel = posixpath.join(cwd, path) if cwd else path
+
+    # Normalize '.', '..', duplicated slashes
+    s = posixpath.normpath(rel)
+    if s == ".":
+        s = ""
+    if s.startswith(".."):
+        raise ValueError("Invalid path")
+
+    # Preserve explicit user intent for dirs
+    if is_dir_hint and s and not s.endswith("/"):
+        s += "/"
+
+    return s
+
+def _all_safe(names: List[str]) -> bool:
+    """
+    Bulk form of _is_safe_member: one C-level scan of the joined names. False only means a
+    name *may* be unsafe (somewhere there is '..', ':' or a leading separator) and needs the
+    per-name check.
+    """
+    blob = "\0" + "\0".join(names)
+    return ".." not in blob and ":" not in blob and "\0/" not in blob and "\0\\" not in blob
+
+def _has_suffix(lname: str, suffixes: Tuple[str, ...]) -> bool:
+    """
+    lname ends in one of suffixes after a stem with a non-dot character, as posixpath.splitext
+    sees it: "dir/.txt" is a dotfile with no extension, not a ".txt" file.
+    """
+    stem_start = lname.rfind("/") + 1
+    return any(
+        lname.endswith(s) and lname[stem_start:len(lname) - len(s)].strip(".") for s in suffixes
+    )
+
 def _normalize_extensions(exts: Optional[Iterable[str]]) -> Optional[Set[str]]:
     if exts is None:
         return None
@@ -52,6 +108,75 @@ def _free_space_bytes(path: str) -> int:
     usage = shutil.disk_usage(path)
     return usage.free
 
+_LOCAL_HEADER = struct.Struct(zipfile.structFileHeader)
+_FH_NAME_LEN, _FH_EXTRA_LEN = 10, 11    # field indexes in the local file header
+_ONESHOT_MAX_BYTES = 64 * 1024 * 1024   # larger members are streamed by zipfile
+_STREAM_CHUNK = 1024 * 1024              # input/output step of the fused inflate+CRC stream
+_COPY_CHUNK_LARGE = 4 * 1024 * 1024      # copyfileobj step for members above _ONESHOT_MAX_BYTES
+_SPACE_MARGIN = 16 * 1024 * 1024         # preflight: needed = uncompressed * 1.05 + this
+_FREE_SPACE_REUSE = 16                   # batches one disk_usage reading is trusted for
+_PARALLEL_MIN_MEMBERS = 4               # smaller batches run inline: pool dispatch costs more than it saves
+_RETRY_BASE_DELAY = 0.1                  # seconds before the first retry of an OSError; doubles per attempt
+_RETRY_MAX_DELAY = 2.0
+
+_HAS_FILE_SENDFILE = sys.platform.startswith("linux") and hasattr(os, "sendfile")  # file -> file copies
+_WRITE_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+_COMP_NAMES = {                          # info() labels, built once
+    getattr(zipfile, "ZIP_STORED", None): "STORED",
+    getattr(zipfile, "ZIP_DEFLATED", None): "DEFLATED",
+    getattr(zipfile, "ZIP_BZIP2", None): "BZIP2",
+    getattr(zipfile, "ZIP_LZMA", None): "LZMA",
+}
+_MADV_WILLNEED = getattr(mmap, "MADV_WILLNEED", None)  # POSIX only
+_PREFETCH_GAP = 1024 * 1024              # member spans closer than this share one madvise call
+_ORDER_TYPECODE = "I" if array.array("I").itemsize == 4 else "L"  # uint32 array typecode
+_ORDER_FORMAT = "u32le"                  # .order file layout, whatever the host's byte order
+
+def _write_all(fd: int, data) -> None:
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view):]
+
+def _write_file(path: str, data: bytes) -> None:
+    """Write a whole buffer with raw os.open/os.write (no buffered-file layer)."""
+    fd = os.open(path, _WRITE_FLAGS, 0o666)
+    try:
+        _write_all(fd, data)
+    finally:
+        os.close(fd)
+
+def _map_readonly(fp) -> Optional[mmap.mmap]:
+    """Map an open archive read-only; None when mmap is unavailable (e.g. no address space)."""
+    try:
+        return mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError, OverflowError):
+        return None
+
+def _dir_prefixes(names: Iterable[str]) -> frozenset:
+    """Every '/'-terminated prefix of every name: the explicit and implicit directories."""
+    dirs: Set[str] = set()
+    for n in names:
+        i = n.rfind("/")
+        while i >= 0:
+            d = n[:i + 1]
+            if d in dirs:
+                break  # its parents were added with it
+            dirs.add(d)
+            i = n.rfind("/", 0, i)
+    return frozenset(dirs)
+
+def _check_crc(zi: zipfile.ZipInfo, data: bytes) -> None:
+    if zlib.crc32(data) != zi.CRC:
+        raise zipfile.BadZipFile(f"Bad CRC-32 for file {zi.filename!r}")
+
+def _can_read_oneshot(zi: zipfile.ZipInfo) -> bool:
+    """True if the member can be decoded in a single call (no encryption, STORED/DEFLATED, small)."""
+    if zi.flag_bits & 0x1:
+        return False
+    if zi.compress_type not in (zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED):
+        return False
+    return zi.file_size <= _ONESHOT_MAX_BYTES
+
 # ----------------- class -----------------
 
 class ZipNavigator(Iterator[List[str]]):
@@ -61,31 +186,37 @@ class ZipNavigator(Iterator[List[str]]):
 
     def exists(self, path: str) -> bool:
         rel = self._resolve(path)
-        return self._zpath(rel).exists()
+        return rel in self._info_by_name or self._dir_exists_in_zip(rel)
 
     def is_dir(self, path: str) -> bool:
         rel = self._resolve(path)
-        return self._zpath(rel).is_dir()
+        return self._dir_exists_in_zip(rel)
 
     def is_file(self, path: str) -> bool:
         rel = self._resolve(path)
-        return self._zpath(rel).is_file()
+        return rel in self._info_by_name and not rel.endswith("/")
 
     # ----- lifecycle -----
 
     def __init__(self, zip_path: str):
         self.zip_path = os.fspath(zip_path)
+        self._abs_zip_path = os.path.abspath(self.zip_path)  # fixed at open (a later chdir can't change it)
         if not os.path.isfile(self.zip_path):
             raise FileNotFoundError(self.zip_path)
-        self._zip = zipfile.ZipFile(self.zip_path, "r")
+        self._open_archive()
+        self._names: List[str] = sorted(self._info_by_name)  # sorted, deduplicated member names
+        self._dirs = _dir_prefixes(self._names)  # "a/", "a/b/", ... (explicit or implicit)
+        self._ls_cache: Dict[str, List[str]] = {}  # recursive listings by prefix (archive is read-only)
+        self._children: Optional[Dict[str, List[str]]] = None  # dir prefix -> sorted entries, built on first ls()
         self._cwd = ""   # current location inside the zip ("" = root)
 
         # Iterator state
         self._iter_active = False
         self._extract_dir: Optional[str] = None
         self._state_path: Optional[str] = None
+        self._log_fh: Optional[IO[str]] = None  # per-batch state log, kept open between batches
         self._batch_size: Optional[int] = None
-        self._order: Optional[List[str]] = None
+        self._order: Optional[array.array] = None  # shuffled uint32 indices into self._names
         self._cursor: int = 0
         self._base_at_init: str = ""
         self._seed: Optional[int] = None
@@ -96,20 +227,29 @@ class ZipNavigator(Iterator[List[str]]):
         self._max_retries: int = 1
         self._validate_crc: bool = False
         self._failed: List[str] = []     # members that permanently failed
+        self._failed_set: Set[str] = set()  # same members, for O(1) dedup per batch
+        self._made_dirs: Set[str] = set()  # output dirs already created for the current batch
+        # Preflight: last disk_usage reading [free, batches since], bound on space still needed
+        self._free_reading: Optional[List[int]] = None
+        self._space_bound: Optional[int] = None
+
+        # Parallel extraction (workers > 1): each pool thread reads through its own ZipFile
+        self._workers: int = 1
+        self._extract_format: str = "files"  # "files" | "tar"
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._tls = threading.local()
+        self._worker_zips: List[zipfile.ZipFile] = []
 
     # ---------------- Navigation ----------------
 
-    def _zpath(self, rel: str) -> zipfile.Path:
-        """
-        Map a ZIP-internal path to zipfile.Path.
-        Be tolerant with implicit directories: try "<name>/" if "<name>" doesn't exist.
-        """
-        p = zipfile.Path(self._zip, at=rel)
-        if rel and not rel.endswith("/") and (not p.is_dir() and not p.exists()):
-            p2 = zipfile.Path(self._zip, at=rel + "/")
-            if p2.is_dir() or p2.exists():
-                return p2
-        return p
+    def _file_info(self, rel: str) -> zipfile.ZipInfo:
+        """ZipInfo of the file at rel; IsADirectoryError / FileNotFoundError otherwise (O(1) lookups)."""
+        zi = self._info_by_name.get(rel)
+        if zi is None or rel.endswith("/"):
+            if self._dir_exists_in_zip(rel):
+                raise IsADirectoryError(rel)
+            raise FileNotFoundError(rel)
+        return zi
 
     def pwd(self) -> str:
         """Return the current working directory inside the zip."""
@@ -119,11 +259,41 @@ class ZipNavigator(Iterator[List[str]]):
         """True if there is at least one member under 'rel/' in the ZIP."""
         if rel == "" or rel == "/":
             return True
-        prefix = rel.rstrip("/") + "/"
-        for name in self._zip.namelist():
-            if name.startswith(prefix):
-                return True
-        return False
+        return rel.rstrip("/") + "/" in self._dirs
+
+    def _children_index(self) -> Dict[str, List[str]]:
+        """
+        Immediate children of every directory ("" = root), with '/' on subdirectories.
+        Built once from the name table and the directory set; the archive is read-only.
+        """
+        if self._children is None:
+            # every file and every dir lands in exactly one parent, so plain lists need no dedup.
+            # Files arrive sorted (name table order), dirs too: each child list is two sorted
+            # runs, which the final sort merges in linear time.
+            children: Dict[str, List[str]] = {}
+            for name in self._names:
+                if not name.endswith("/"):
+                    children.setdefault(name[:name.rfind("/") + 1], []).append(name)
+            for d in sorted(self._dirs):
+                children.setdefault(d[:d.rfind("/", 0, len(d) - 1) + 1], []).append(d)
+            for entries in children.values():
+                entries.sort()
+            self._children = children
+        return self._children
+
+    def _names_span(self, prefix: str) -> Tuple[int, int]:
+        """[lo, hi) slice of the sorted name table holding the names that start with prefix."""
+        names = self._names
+        lo = bisect.bisect_left(names, prefix)
+        hi = lo
+        while hi < len(names) and names[hi].startswith(prefix):
+            hi += 1
+        return lo, hi
+
+    def _names_under(self, prefix: str) -> List[str]:
+        """Member names starting with prefix, in sorted order (bisect into the name table)."""
+        lo, hi = self._names_span(prefix)
+        return self._names[lo:hi]
 
     def _resolve(self, path: Optional[str]) -> str:
         """
@@ -137,57 +307,47 @@ class ZipNavigator(Iterator[List[str]]):
         if path is None:
             return self._cwd
 
-        path = path.replace("\\", "/")
-        is_dir_hint = path.endswith("/")
-
-        # Absolute → strip leading '/', else join to cwd
-        if path.startswith("/"):
-            rel = path[1:]
-        else:
-            rel = posixpath.join(self._cwd, path) if self._cwd else path
+        # already-clean paths (no '\\', '//', or segment starting with '.') need no normpath
+        if "\\" not in path and "//" not in path and "/." not in path and not path.startswith("."):
+            if path.startswith("/"):
+                return path[1:]
+            cwd = self._cwd
+            if not cwd or cwd.endswith("/"):
+                return cwd + path
 
-        # Normalize '.', '..', duplicated slashes
-        s = posixpath.normpath(rel)
-        if s == ".":
-            s = ""
-        if s.startswith(".."):
-            raise ValueError("Invalid path")
-
-        # Preserve explicit user intent for dirs
-        if is_dir_hint and s and not s.endswith("/"):
-            s += "/"
-
-        return s
+        return _normalize_path(self._cwd, path)
 
     def ls(self, path: Optional[str] = None, recursive: bool = False) -> list[str]:
         """List entries under a path. Append '/' to directory names."""
         rel = self._resolve(path)
-        base = self._zpath(rel)
 
-        if not base.is_dir():
-            if base.exists():
+        if not self._dir_exists_in_zip(rel):
+            if rel in self._info_by_name:
                 raise NotADirectoryError(rel)
             raise FileNotFoundError(rel)
 
         if not recursive:
-            out: list[str] = []
-            for c in base.iterdir():
-                name = c.name + ("/" if c.is_dir() else "")
-                out.append(posixpath.join(rel, name) if rel else name)
-            return sorted(out)
-
-        out: list[str] = []
-        stack = [(rel, base)]
-        while stack:
-            cur_rel, cur = stack.pop()
-            for child in cur.iterdir():
-                child_rel = posixpath.join(cur_rel, child.name) if cur_rel else child.name
-                if child.is_dir():
-                    out.append(child_rel + "/")
-                    stack.append((child_rel, child))
-                else:
-                    out.append(child_rel)
-        return sorted(out)
+            prefix = rel.rstrip("/") + "/" if rel else ""
+            return list(self._children_index().get(prefix, ()))
+
+        # one flat pass over the sorted names under the prefix; implicit dirs come from the '/'s
+        prefix = rel.rstrip("/") + "/" if rel else ""
+        cached = self._ls_cache.get(prefix)
+        if cached is not None:
+            return list(cached)
+        plen = len(prefix)
+        found: Set[str] = set()
+        for name in self._names_under(prefix):
+            if len(name) == plen:
+                continue  # explicit entry for the base directory itself
+            found.add(name)
+            i = name.find("/", plen)
+            while 0 <= i < len(name) - 1:
+                found.add(name[:i + 1])
+                i = name.find("/", i + 1)
+        out = sorted(found)
+        self._ls_cache[prefix] = out
+        return list(out)
 
     def cd(self, path: str) -> str:
         """
@@ -210,8 +370,7 @@ class ZipNavigator(Iterator[List[str]]):
             return self.pwd()
 
         # If it's an existing file → not a directory
-        p = self._zpath(rel)
-        if p.exists():
+        if rel in self._info_by_name:
             raise NotADirectoryError(rel)
 
         # Not found
@@ -220,39 +379,21 @@ class ZipNavigator(Iterator[List[str]]):
     def cat(self, path: str, encoding="utf-8", errors="strict"):
         """Read a file as text (default) or bytes if encoding=None."""
         rel = self._resolve(path)
-        zp = self._zpath(rel)
-
-        if not zp.exists():
-            raise FileNotFoundError(rel)
-        if zp.is_dir():
-            raise IsADirectoryError(rel)
-        if not zp.is_file():
-            raise FileNotFoundError(rel)
-
-        with zp.open("rb") as f:
-            data = f.read()
+        zi = self._file_info(rel)
+        if _can_read_oneshot(zi):
+            data = self._read_oneshot(zi)
+            _check_crc(zi, data)
+        else:
+            data = self._reader().read(zi)  # zipfile checks the CRC while streaming
         return data.decode(encoding, errors=errors) if encoding else data
 
     def info(self, path: str) -> dict[str, Any]:
         """Return file metadata: sizes, timestamp, CRC, compression type."""
         rel = self._resolve(path)
-        zp = self._zpath(rel)
-
-        if zp.is_dir():
-            raise IsADirectoryError(rel)
-
-        try:
-            zi = self._zip.getinfo(rel)
-        except KeyError:
-            raise FileNotFoundError(rel)
+        zi = self._file_info(rel)
 
         comp = zi.compress_type
-        comp_name = {
-            getattr(zipfile, "ZIP_STORED", None): "STORED",
-            getattr(zipfile, "ZIP_DEFLATED", None): "DEFLATED",
-            getattr(zipfile, "ZIP_BZIP2", None): "BZIP2",
-            getattr(zipfile, "ZIP_LZMA", None): "LZMA",
-        }.get(comp, str(comp))
+        comp_name = _COMP_NAMES.get(comp, str(comp))
 
         return {
             "filename": zi.filename,
@@ -267,7 +408,7 @@ class ZipNavigator(Iterator[List[str]]):
 
     def initialize_iterator(
         self,
-        output_dir: str,
+        output_dir: Optional[str],
         batch_size: int = 100,
         extract_subdir: str = "extracted_zip",
         reset: bool = False,
@@ -276,9 +417,15 @@ class ZipNavigator(Iterator[List[str]]):
         on_error: str = "skip",          # "skip" | "abort"
         max_retries: int = 1,
         validate_crc: bool = False,
+        workers: Optional[int] = 1,
+        extract_format: str = "files",   # "files" | "tar"
     ) -> None:
         """
         Prepare batched extraction with persistent state.
+        workers > 1 extracts the members of each batch on a thread pool (workers=None: one per CPU).
+        output_dir=None reads batches into memory as (arcname, bytes) pairs:
+        no files, no state file (so no resume).
+        extract_format="tar" writes each batch as a single tar file and yields [tar_path].
         """
         if batch_size <= 0:
             raise ValueError("batch_size must be > 0")
@@ -286,22 +433,38 @@ class ZipNavigator(Iterator[List[str]]):
             raise ValueError("on_error must be 'skip' or 'abort'")
         if max_retries < 0:
             raise ValueError("max_retries must be >= 0")
-
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if workers <= 0:
+            raise ValueError("workers must be > 0")
+        if extract_format not in {"files", "tar"}:
+            raise ValueError("extract_format must be 'files' or 'tar'")
+        if extract_format == "tar" and output_dir is None:
+            raise ValueError("extract_format='tar' needs an output_dir")
+
+        self._shutdown_pool()
+        self._free_reading = self._space_bound = None
         self._extensions = _normalize_extensions(extensions)
         self._on_error = on_error
         self._max_retries = int(max_retries)
         self._validate_crc = bool(validate_crc)
+        self._workers = int(workers)
+        self._extract_format = extract_format
 
-        extract_dir = os.path.join(output_dir, extract_subdir)
-        state_path = os.path.join(extract_dir, ".zip_iter_state.json")
-
-        if reset and os.path.isdir(extract_dir):
-            shutil.rmtree(extract_dir)
-        os.makedirs(extract_dir, exist_ok=True)
-
-        if (not reset) and os.path.isfile(state_path):
+        if output_dir is None:
+            extract_dir = state_path = None
+        else:
+            extract_dir = os.path.join(output_dir, extract_subdir)
+            state_path = self._state_path_for(extract_dir)
+            if reset:
+                self._remove_state_files(state_path)
+                if os.path.isdir(extract_dir):
+                    shutil.rmtree(extract_dir)
+            os.makedirs(extract_dir, exist_ok=True)
+
+        if state_path and (not reset) and os.path.isfile(state_path):
             state = self._load_state(state_path)
-            if state.get("zip_path") != os.path.abspath(self.zip_path):
+            if state.get("zip_path") != self._abs_zip_path:
                 raise RuntimeError("State belongs to a different ZIP")
             if state.get("base_at_init") != self._resolve(None):
                 raise RuntimeError("Different base position inside the ZIP")
@@ -309,176 +472,646 @@ class ZipNavigator(Iterator[List[str]]):
             if saved_ext != self._extensions:
                 raise RuntimeError("Extension filter differs from saved one")
             # load state
-            self._order = state["order"]
+            self._order = self._load_order(state_path, state)
             self._cursor = state["cursor"]
             self._batch_size = state["batch_size"]
             self._seed = state["seed"]
             self._failed = list(state.get("failed", []))
+            self._failed_set = set(self._failed)
             # load policies
             self._on_error = state.get("on_error", self._on_error)
             self._max_retries = int(state.get("max_retries", self._max_retries))
             self._validate_crc = bool(state.get("validate_crc", self._validate_crc))
+            self._workers = int(state.get("workers", self._workers))
+            self._extract_format = state.get("extract_format", "files")
         else:
             base_rel = self._resolve(None)  # keep cwd as-is
             # Require base to be a directory (root "" or endswith "/")
             if base_rel and not base_rel.endswith("/"):
                 raise RuntimeError("Base must be a directory path ending with '/'.")
-            file_list = self._scan_all_files_under(base_rel)
-            file_list = [f for f in file_list if _is_safe_member(f)]
-            if self._extensions:
-                file_list = [f for f in file_list if posixpath.splitext(f)[1].lower() in self._extensions]
-            if not file_list:
+            file_idx = self._scan_all_files_under(
+                base_rel, tuple(self._extensions) if self._extensions else None, safe_only=True
+            )
+            if not file_idx:
                 raise RuntimeError("No files found with the requested filter")
-            order = list(file_list)
+            # 4 bytes per entry; shuffling an array draws the same permutation a list would
+            order = array.array(_ORDER_TYPECODE, file_idx)
             if seed is None:
                 seed = random.randrange(1, 2**63)
             rnd = random.Random(seed)
             rnd.shuffle(order)
             self._order, self._cursor, self._batch_size, self._seed = order, 0, batch_size, seed
             self._failed = []
-
-            self._save_state(
-                state_path,
-                {
-                    "zip_path": os.path.abspath(self.zip_path),
-                    "base_at_init": base_rel,
-                    "order": order,
-                    "cursor": 0,
-                    "batch_size": batch_size,
-                    "extract_dir": os.path.abspath(extract_dir),
-                    "seed": seed,
-                    "extensions": sorted(self._extensions) if self._extensions else [],
-                    "failed": [],
-                    "on_error": self._on_error,
-                    "max_retries": self._max_retries,
-                    "validate_crc": self._validate_crc,
-                },
-            )
+            self._failed_set = set()
+
+            if state_path:
+                order_fields = self._save_order(state_path, order)
+                self._save_state(
+                    state_path,
+                    {
+                        "zip_path": self._abs_zip_path,
+                        "base_at_init": base_rel,
+                        **order_fields,
+                        "cursor": 0,
+                        "batch_size": batch_size,
+                        "extract_dir": os.path.abspath(extract_dir),
+                        "seed": seed,
+                        "extensions": sorted(self._extensions) if self._extensions else [],
+                        "failed": [],
+                        "on_error": self._on_error,
+                        "max_retries": self._max_retries,
+                        "validate_crc": self._validate_crc,
+                        "workers": self._workers,
+                        "extract_format": self._extract_format,
+                    },
+                )
 
         self._iter_active = True
         self._extract_dir = extract_dir
         self._state_path = state_path
         self._base_at_init = self._resolve(None)
 
-    def _scan_all_files_under(self, base_rel: str) -> List[str]:
+    def _scan_all_files_under(
+        self, base_rel: str, suffixes: Optional[Tuple[str, ...]] = None, safe_only: bool = False
+    ) -> List[int]:
+        """
+        Indices into the sorted name table of every file under base_rel, optionally limited to
+        names ending (case-insensitively) in one of suffixes and to members safe to extract.
+        Both filters run inside the single pass, so only the final list is ever built.
+        """
         # base must be a directory ("", or endswith "/")
         if base_rel and not base_rel.endswith("/"):
             return []
-        base = self._zpath(base_rel)
-        if not base.is_dir():
+        if not self._dir_exists_in_zip(base_rel):
             return []
-        out: List[str] = []
-        stack = [(base_rel, base)]
-        while stack:
-            cur_rel, cur = stack.pop()
-            for child in cur.iterdir():
-                child_rel = posixpath.join(cur_rel, child.name) if cur_rel else child.name
-                if child.is_dir():
-                    stack.append((child_rel, child))
-                elif child.is_file():
-                    out.append(child_rel)
-        return out
+        # flat pass over the sorted names under the base (no zipfile.Path tree walk)
+        lo, hi = self._names_span(base_rel)
+        names = self._names
+        # the bulk check clears the common case; per-name checks only if some name may be unsafe
+        check_safe = safe_only and not _all_safe(names[lo:hi])
+        if suffixes is None and not check_safe:
+            return [i for i in range(lo, hi) if not names[i].endswith("/")]
+        # one C-level str.endswith over all suffixes (also allows ".tar.gz"-style filters);
+        # only the names it lets through get the dotfile check
+        return [
+            i for i in range(lo, hi)
+            if not names[i].endswith("/")
+            and (suffixes is None or (
+                (lname := names[i].lower()).endswith(suffixes) and _has_suffix(lname, suffixes)
+            ))
+            and (not check_safe or _is_safe_member(names[i]))
+        ]
+
+    @staticmethod
+    def _state_log_path(path: str) -> str:
+        return os.path.splitext(path)[0] + ".log"
+
+    @staticmethod
+    def _state_order_path(path: str) -> str:
+        return os.path.splitext(path)[0] + ".order"
+
+    def _state_files(self, path: str) -> Tuple[str, str, str]:
+        return path, self._state_log_path(path), self._state_order_path(path)
+
+    def _state_path_for(self, extract_dir: str) -> str:
+        """
+        State files sit next to the extraction folder (".<folder>.zip_iter_state.*"), so clearing
+        the folder is a plain rmtree. A state left inside it by older versions is moved out once.
+        """
+        parent, folder = os.path.split(os.path.normpath(extract_dir))
+        state_path = os.path.join(parent, f".{folder}.zip_iter_state.json")
+        old_path = os.path.join(extract_dir, ".zip_iter_state.json")
+        if os.path.isfile(old_path) and not os.path.exists(state_path):
+            # header last: an interrupted move is simply redone on the next call
+            for src, dst in reversed(list(zip(self._state_files(old_path), self._state_files(state_path)))):
+                if os.path.exists(src):
+                    os.replace(src, dst)
+        return state_path
+
+    def _remove_state_files(self, path: str) -> None:
+        self._close_state_log()
+        for p in self._state_files(path):
+            try:
+                os.remove(p)
+            except FileNotFoundError:
+                pass
+
+    def _names_digest(self) -> str:
+        """Fingerprint of the sorted name table the order indices point into."""
+        return hashlib.sha256("\0".join(self._names).encode("utf-8", "surrogatepass")).hexdigest()
+
+    def _save_order(self, path: str, order: array.array) -> Dict[str, Any]:
+        """
+        Write the order once: uint32 little-endian indices into the sorted name table
+        (4 bytes/entry, never rewritten), so a state moves between hosts. Return the header
+        fields that describe it.
+        """
+        if order.itemsize != 4:
+            raise RuntimeError("No 4-byte unsigned array type on this platform")
+        if sys.byteorder == "big":
+            order = array.array(order.typecode, order)
+            order.byteswap()
+        order_path = self._state_order_path(path)
+        tmp = order_path + ".tmp"
+        with open(tmp, "wb") as f:
+            order.tofile(f)
+        os.replace(tmp, order_path)
+        return {"order_len": len(order), "order_format": _ORDER_FORMAT, "names_sha256": self._names_digest()}
+
+    def _load_order(self, path: str, state: Dict[str, Any]) -> array.array:
+        names = self._names
+        if "order" in state:  # older states keep the order inline as names
+            idx = array.array(_ORDER_TYPECODE)
+            for n in state["order"]:
+                i = bisect.bisect_left(names, n)
+                if i == len(names) or names[i] != n:
+                    raise RuntimeError("Saved order does not match the ZIP's member list")
+                idx.append(i)
+            return idx
+        if state.get("names_sha256") != self._names_digest():
+            raise RuntimeError("Saved order does not match the ZIP's member list")
+        # older headers lack the field: their files are in host order, little-endian in practice
+        if state.get("order_format", _ORDER_FORMAT) != _ORDER_FORMAT:
+            raise RuntimeError(f"Unsupported order file format {state['order_format']!r}")
+        idx = array.array(_ORDER_TYPECODE)
+        if idx.itemsize != 4:
+            raise RuntimeError("No 4-byte unsigned array type on this platform")
+        with open(self._state_order_path(path), "rb") as f:
+            idx.frombytes(f.read())
+        if len(idx) != state["order_len"]:
+            raise RuntimeError("Saved order file is truncated")
+        if sys.byteorder == "big":
+            idx.byteswap()
+        return idx
 
     def _save_state(self, path, state):
+        """
+        Write the full state header atomically, then drop the per-batch log it supersedes.
+        A crash in between leaves a log whose records the header already holds; replaying it
+        is harmless (same cursor, failures deduplicated).
+        """
+        self._close_state_log()
         tmp = path + ".tmp"
-        with open(tmp, "w", encoding="utf-8") as f:
-            json.dump(state, f, indent=2, ensure_ascii=False)
+        with open(tmp, "wb") as f:
+            # compact, single encode: no indent (the pure-Python encoder path)
+            f.write(json.dumps(state, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
         os.replace(tmp, path)
+        try:
+            os.remove(self._state_log_path(path))
+        except FileNotFoundError:
+            pass
+
+    def _append_state(self, path, record):
+        """Append one batch record ({"cursor", "failed"}) to the state log: O(1) per batch."""
+        self._check_fork()
+        log_path = self._state_log_path(path)
+        f = self._log_fh
+        if f is None or f.name != log_path:
+            self._close_state_log()
+            f = self._log_fh = open(log_path, "a", encoding="utf-8")
+        f.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n")
+        f.flush()  # one write(2) per batch; the record is on disk before the batch is returned
+
+    def _close_state_log(self) -> None:
+        f, self._log_fh = self._log_fh, None
+        if f is not None:
+            try:
+                f.close()
+            except OSError:
+                pass
 
     def _load_state(self, path):
+        """Load the state header and replay the per-batch log on top of it."""
         with open(path, "r", encoding="utf-8") as f:
-            return json.load(f)
+            state = json.load(f)
+        try:
+            with open(self._state_log_path(path), "r", encoding="utf-8") as f:
+                lines = f.read().splitlines()
+        except FileNotFoundError:
+            return state
+        failed = list(state.get("failed", []))
+        seen = set(failed)
+        torn = False
+        for line in lines:
+            try:
+                rec = json.loads(line)
+            except ValueError:
+                torn = True  # interrupted append: keep what was fully logged
+                break
+            state["cursor"] = rec["cursor"]
+            for m in rec.get("failed", []):
+                if m not in seen:  # already folded into the header by an interrupted save
+                    seen.add(m)
+                    failed.append(m)
+        state["failed"] = failed
+        if torn:
+            # fold the log into the header so later appends don't land after a torn line
+            self._save_state(path, state)
+        return state
 
     def _clear_extract_dir(self):
-        for root, dirs, files in os.walk(self._extract_dir, topdown=False):
-            for name in files:
-                try:
-                    os.remove(os.path.join(root, name))
-                except FileNotFoundError:
-                    pass
-            for name in dirs:
-                try:
-                    os.rmdir(os.path.join(root, name))
-                except OSError:
-                    pass
+        self._made_dirs = set()
+        # the state lives outside the folder, so nothing inside needs preserving
+        shutil.rmtree(self._extract_dir, ignore_errors=True)
+        os.makedirs(self._extract_dir, exist_ok=True)
 
     # ---- Extraction with error handling ----
 
     def _preflight_space(self, members: List[str]) -> None:
-        """Estimate needed space and fail early if disk is clearly insufficient."""
+        """
+        Estimate needed space and fail early if disk is clearly insufficient.
+        A free-space reading is reused for up to _FREE_SPACE_REUSE batches; while it covers
+        everything left to extract, batches skip the per-member sum as well.
+        """
         assert self._extract_dir and self._order is not None
-        total_uncompressed = 0
-        for m in members:
-            try:
-                zi = self._zip.getinfo(m)
-                total_uncompressed += getattr(zi, "file_size", 0)
-            except KeyError:
-                continue
+        by_name = self._info_by_name
+        fresh = self._free_reading is None or self._free_reading[1] >= _FREE_SPACE_REUSE
+        if fresh:
+            self._free_reading = [_free_space_bytes(self._extract_dir), 0]
+        self._free_reading[1] += 1
+        if self._space_bound is None:
+            # computed once per run: no batch can need more than what is still to extract
+            names = self._names
+            left = sum(by_name[names[i]].file_size for i in self._order[self._cursor:])
+            self._space_bound = int(left * 1.05) + _SPACE_MARGIN
+        if self._free_reading[0] >= self._space_bound:
+            return
+        total_uncompressed = sum(by_name[m].file_size for m in members if m in by_name)
         # 5% margin + 16 MiB
-        needed = int(total_uncompressed * 1.05) + 16 * 1024 * 1024
-        free = _free_space_bytes(self._extract_dir)
+        needed = int(total_uncompressed * 1.05) + _SPACE_MARGIN
+        if self._free_reading[0] < needed and not fresh:
+            self._free_reading = [_free_space_bytes(self._extract_dir), 1]  # re-read before failing
+        free = self._free_reading[0]
         if free < needed:
             raise RuntimeError(
                 f"Insufficient free space in extraction folder: "
                 f"need ~{needed/1e6:.1f} MB, free ~{free/1e6:.1f} MB."
             )
 
+    # ---- Reader handles / worker pool ----
+
+    def _reader(self) -> zipfile.ZipFile:
+        """ZipFile for the calling thread: pool workers have their own (the file offset is shared state)."""
+        self._check_fork()
+        return getattr(self._tls, "zip", None) or self._zip
+
+    def _init_worker(self) -> None:
+        zf = zipfile.ZipFile(self._abs_zip_path, "r")
+        self._tls.zip = zf
+        self._worker_zips.append(zf)
+
+    def _get_pool(self) -> ThreadPoolExecutor:
+        self._check_fork()
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self._workers, initializer=self._init_worker)
+        return self._pool
+
+    def _shutdown_pool(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+        for zf in self._worker_zips:
+            try:
+                zf.close()
+            except Exception:
+                pass
+        self._worker_zips = []
+
+    def _prefetch(self, members: List[str]) -> None:
+        """
+        Hint the kernel to start reading a batch's member data (madvise WILLNEED on the mapping),
+        so page faults during extraction find it in the page cache. members are in offset order;
+        nearby spans are coalesced into one call.
+        """
+        if self._mm is None or _MADV_WILLNEED is None or not members:
+            return
+        by_name = self._info_by_name
+        ranges: List[List[int]] = []
+        for m in members:
+            zi = by_name.get(m)
+            if zi is None:
+                continue
+            start = zi.header_offset
+            # central-directory lengths: close enough to the local header for a hint
+            end = start + _LOCAL_HEADER.size + len(zi.filename.encode("utf-8")) + len(zi.extra) + zi.compress_size
+            if ranges and start - ranges[-1][1] <= _PREFETCH_GAP:
+                ranges[-1][1] = max(ranges[-1][1], end)
+            else:
+                ranges.append([start, end])
+        size = len(self._mm)
+        for start, end in ranges:
+            start -= start % mmap.PAGESIZE
+            try:
+                self._mm.madvise(_MADV_WILLNEED, start, min(end, size) - start)
+            except (OSError, ValueError):
+                return  # advisory only
+
+    def _data_span(self, zi: zipfile.ZipInfo) -> Tuple[int, int]:
+        """(start, end) offsets of a member's compressed bytes, past its local header."""
+        off = zi.header_offset
+        if self._mm is not None:
+            header = self._mm[off:off + _LOCAL_HEADER.size]
+        else:
+            fp = self._reader().fp
+            fp.seek(off)
+            header = fp.read(_LOCAL_HEADER.size)
+        if len(header) != _LOCAL_HEADER.size or header[:4] != zipfile.stringFileHeader:
+            raise zipfile.BadZipFile(f"Bad local header for {zi.filename}")
+        fields = _LOCAL_HEADER.unpack(header)
+        start = off + _LOCAL_HEADER.size + fields[_FH_NAME_LEN] + fields[_FH_EXTRA_LEN]
+        end = start + zi.compress_size
+        if self._mm is not None and end > len(self._mm):
+            raise zipfile.BadZipFile(f"Truncated data for {zi.filename}")
+        return start, end
+
+    def _read_compressed(self, zi: zipfile.ZipInfo) -> bytes:
+        """Read the raw (still compressed) bytes of a member, skipping its local header."""
+        start, end = self._data_span(zi)
+        if self._mm is not None:
+            return self._mm[start:end]
+        fp = self._reader().fp
+        fp.seek(start)
+        data = fp.read(end - start)
+        if len(data) != zi.compress_size:
+            raise zipfile.BadZipFile(f"Truncated data for {zi.filename}")
+        return data
+
+    def _read_oneshot(self, zi: zipfile.ZipInfo) -> bytes:
+        """Decode a member with one zlib call instead of zipfile's chunked stream."""
+        if zi.compress_type == zipfile.ZIP_DEFLATED and self._mm is not None:
+            # inflate straight from the mapping; views are released before returning
+            start, end = self._data_span(zi)
+            with memoryview(self._mm) as mv, mv[start:end] as view:
+                data = zlib.decompress(view, -zlib.MAX_WBITS, max(zi.file_size, 1))
+        else:
+            data = self._read_compressed(zi)
+            if zi.compress_type == zipfile.ZIP_DEFLATED:
+                data = zlib.decompress(data, -zlib.MAX_WBITS, max(zi.file_size, 1))
+        if len(data) != zi.file_size:
+            raise zipfile.BadZipFile(f"Size mismatch for {zi.filename}")
+        return data
+
+    def _dest_path(self, member: str, out_root: str) -> str:
+        """Output path for a member, creating its parent directory once per batch."""
+        dest_path = os.path.join(out_root, *member.split("/"))
+        dest_dir = os.path.dirname(dest_path)
+        if dest_dir not in self._made_dirs:
+            os.makedirs(dest_dir, exist_ok=True)
+            self._made_dirs.add(dest_dir)
+        return dest_path
+
+    def _sendfile_stored(self, zi: zipfile.ZipInfo, dest_path: str) -> bool:
+        """
+        Copy a mapped STORED member archive -> file inside the kernel (Linux os.sendfile), any
+        size, after one zlib.crc32 over its span in the mapping (raises on a mismatch).
+        Return False (nothing written) if the platform or filesystem can't do it.
+        """
+        if not _HAS_FILE_SENDFILE or self._mm is None or zi.compress_type != zipfile.ZIP_STORED \
+                or zi.flag_bits & 0x1:
+            return False
+        if zi.compress_size != zi.file_size:
+            raise zipfile.BadZipFile(f"Size mismatch for {zi.filename}")
+        start, end = self._data_span(zi)
+        with memoryview(self._mm) as mv, mv[start:end] as view:
+            _check_crc(zi, view)
+        in_fd = self._reader().fp.fileno()
+        fd = os.open(dest_path, _WRITE_FLAGS, 0o666)
+        try:
+            offset = start
+            while offset < end:
+                try:
+                    sent = os.sendfile(fd, in_fd, offset, end - offset)
+                except OSError:
+                    if offset == start:
+                        return False  # unsupported here: caller uses the buffered path
+                    raise
+                if sent == 0:
+                    raise zipfile.BadZipFile(f"Truncated data for {zi.filename}")
+                offset += sent
+        finally:
+            os.close(fd)
+        return True
+
     def _extract_one_raw(self, member: str, out_root: str) -> str:
-        """Standard extraction (zipfile.extract)."""
-        abs_path = self._zip.extract(member, path=out_root)
-        return os.path.abspath(abs_path)
+        """
+        Standard extraction: mapped STORED members are CRC-checked in place and copied with
+        sendfile where available, small STORED/DEFLATED members are decoded in one shot and
+        CRC-checked, the rest go through zipfile.extract (whose stream checks the CRC itself).
+        """
+        zi = self._info_by_name[member]
+        if _HAS_FILE_SENDFILE and self._mm is not None and zi.compress_type == zipfile.ZIP_STORED:
+            dest_path = self._dest_path(member, out_root)
+            if self._sendfile_stored(zi, dest_path):
+                return os.path.abspath(dest_path)
+        if not _can_read_oneshot(zi):
+            abs_path = self._reader().extract(member, path=out_root)
+            return os.path.abspath(abs_path)
+        data = self._read_oneshot(zi)
+        _check_crc(zi, data)
+        dest_path = self._dest_path(member, out_root)
+        _write_file(dest_path, data)
+        return os.path.abspath(dest_path)
 
     def _extract_one_crc(self, member: str, out_root: str) -> str:
         """
-        Manual extraction with integrity verification.
-        If decompression or CRC fails, zipfile will raise during read/close.
+        Manual extraction with integrity verification (validate_crc=True). Every member is
+        CRC-checked on the standard path too; this one differs for large members only.
+        Mapped STORED members are CRC-checked in place (one zlib.crc32 over the mapping) and
+        copied by the kernel. Small STORED/DEFLATED members are decoded in one shot and checked
+        with a single zlib.crc32 call; larger ones are inflated and CRC-checked in one fused pass
+        over the mapping; otherwise zipfile raises on CRC/decompression errors while streaming.
         """
         # output path
-        dest_path = os.path.join(out_root, *member.split("/"))
-        dest_dir = os.path.dirname(dest_path)
-        os.makedirs(dest_dir, exist_ok=True)
-        # stream
-        with self._zip.open(member, "r") as src, open(dest_path, "wb") as dst:
-            while True:
-                chunk = src.read(1024 * 1024)
-                if not chunk:
-                    break
-                dst.write(chunk)
+        dest_path = self._dest_path(member, out_root)
+        zi = self._info_by_name[member]
+        if self._sendfile_stored(zi, dest_path):
+            return os.path.abspath(dest_path)
+        if _can_read_oneshot(zi):
+            data = self._read_oneshot(zi)
+            _check_crc(zi, data)
+            _write_file(dest_path, data)
+            return os.path.abspath(dest_path)
+        if self._stream_checked(zi, dest_path):
+            return os.path.abspath(dest_path)
+        # stream (chunks larger than the file buffer are written straight through)
+        length = _COPY_CHUNK_LARGE if zi.file_size > _ONESHOT_MAX_BYTES else _STREAM_CHUNK
+        with self._reader().open(member, "r") as src, open(dest_path, "wb") as dst:
+            shutil.copyfileobj(src, dst, length)
         return os.path.abspath(dest_path)
 
-    def _extract_members(self, members: List[str]) -> Tuple[List[str], List[str]]:
+    def _stream_checked(self, zi: zipfile.ZipInfo, dest_path: str) -> bool:
         """
-        Attempt to extract a list of members.
-        Return (success_paths, failed_members).
+        Large members: inflate from the mapping in bounded steps, updating the CRC and writing
+        each output chunk as it is produced (one pass over the output). Output never exceeds
+        the declared file_size; on any failure the partial file is removed. Return False if the
+        member can't take this path (no mapping, encrypted, other compression methods).
         """
-        assert self._extract_dir
-        ok_paths: List[str] = []
+        if self._mm is None or zi.flag_bits & 0x1:
+            return False
+        if zi.compress_type not in (zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED):
+            return False
+        start, end = self._data_span(zi)
+        inflater = zlib.decompressobj(-zlib.MAX_WBITS) if zi.compress_type == zipfile.ZIP_DEFLATED else None
+        crc = size = 0
+        fd = os.open(dest_path, _WRITE_FLAGS, 0o666)
+
+        def emit(out) -> None:
+            # stop at the declared size, like ZipExtFile: an understated file_size passed preflight
+            nonlocal crc, size
+            size += len(out)
+            if size > zi.file_size:
+                raise zipfile.BadZipFile(f"Member {zi.filename!r} is larger than its declared size")
+            crc = zlib.crc32(out, crc)
+            _write_all(fd, out)
+
+        try:
+            try:
+                with memoryview(self._mm) as mv:
+                    for off in range(start, end, _STREAM_CHUNK):
+                        with mv[off:min(off + _STREAM_CHUNK, end)] as chunk:
+                            if inflater is None:
+                                emit(chunk)
+                                continue
+                            data = chunk
+                            while data:
+                                # one byte past the declared size is enough to detect overflow
+                                emit(inflater.decompress(data, min(_STREAM_CHUNK, zi.file_size - size + 1)))
+                                data = inflater.unconsumed_tail
+                    if inflater is not None:
+                        emit(inflater.flush())
+            finally:
+                os.close(fd)
+            if size != zi.file_size or crc != zi.CRC:
+                raise zipfile.BadZipFile(f"Bad CRC-32 for file {zi.filename!r}")
+        except BaseException:
+            try:
+                os.remove(dest_path)  # no partial member left behind
+            except OSError:
+                pass
+            raise
+        return True
+
+    def _add_to_tar(self, tf: tarfile.TarFile, member: str) -> str:
+        """
+        Tar mode: append one member to the batch's open tar as its data arrives. Small members
+        come from the CRC-checked one-shot buffer, larger ones are streamed through zipfile
+        (never held whole in memory). A failed member is cut back out of the tar.
+        """
+        zi = self._info_by_name[member]
+        ti = tarfile.TarInfo(member)
+        ti.size = zi.file_size
+        ti.mtime = int(time.mktime(zi.date_time + (0, 0, -1)))
+        pos = tf.offset
+        try:
+            if _can_read_oneshot(zi):
+                data = self._read_oneshot(zi)
+                _check_crc(zi, data)
+                tf.addfile(ti, io.BytesIO(data))
+            else:
+                with self._reader().open(member, "r") as src:
+                    tf.addfile(ti, src)
+                    if src.read(1):  # also drives the stream to EOF, where zipfile checks the CRC
+                        raise zipfile.BadZipFile(f"Member {member!r} is larger than its declared size")
+        except BaseException:
+            # the next entry starts where this one did
+            tf.fileobj.seek(pos)
+            tf.fileobj.truncate()
+            tf.offset = pos
+            raise
+        return member
+
+    def _read_one(self, member: str) -> bytes:
+        """In-memory mode: return a member's bytes, CRC-checked (by zipfile on fallback)."""
+        zi = self._info_by_name[member]
+        if not _can_read_oneshot(zi):
+            return self._reader().read(member)
+        data = self._read_oneshot(zi)
+        _check_crc(zi, data)
+        return data
+
+    def _extract_with_retries(
+        self, member: str, tf: Optional[tarfile.TarFile] = None
+    ) -> Tuple[Any, Optional[Exception]]:
+        """
+        Extract one member honoring max_retries. Return (result, None) or (None, last_error);
+        result is the extracted path, (member, bytes) in in-memory mode, or the member once
+        appended to tf in tar mode.
+        Only OSErrors (ENOSPC, EBUSY, ...) are retried, after an exponential backoff with
+        jitter; corrupt data or unsupported members fail on the first attempt.
+        """
+        last_err: Optional[Exception] = None
+        for attempt in range(self._max_retries + 1):
+            try:
+                if tf is not None:
+                    return self._add_to_tar(tf, member), None
+                if self._extract_dir is None:
+                    return (member, self._read_one(member)), None
+                if self._validate_crc:
+                    return self._extract_one_crc(member, self._extract_dir), None
+                return self._extract_one_raw(member, self._extract_dir), None
+            except OSError as e:
+                last_err = e
+                if attempt < self._max_retries:
+                    delay = min(_RETRY_BASE_DELAY * (2 ** attempt), _RETRY_MAX_DELAY)
+                    time.sleep(delay * (0.5 + random.random()))
+            except Exception as e:  # BadZipFile, zlib.error, encrypted/unsupported member: retrying won't help
+                return None, e
+        return None, last_err
+
+    def _extract_members(
+        self, members: List[str], tf: Optional[tarfile.TarFile] = None
+    ) -> Tuple[List[Any], List[str]]:
+        """
+        Attempt to extract a list of members (in parallel if workers > 1).
+        Members are read in archive offset order (sequential I/O, OS readahead);
+        return (success_paths, failed_members), both in batch order.
+        In in-memory mode successes are (member, bytes) pairs. With tf (tar mode) members are
+        appended to it one at a time, in offset order, and successes are member names.
+        """
+        ok_paths: List[Any] = []
         failed: List[str] = []
 
-        for m in members:
-            if not _is_safe_member(m):
-                failed.append(m)
-                if self._on_error == "abort":
-                    raise RuntimeError(f"Unsafe ZIP member: {m}")
-                continue
+        safe = [i for i, m in enumerate(members) if _is_safe_member(m)]
+        if len(safe) < len(members) and self._on_error == "abort":
+            unsafe = next(m for m in members if not _is_safe_member(m))
+            raise RuntimeError(f"Unsafe ZIP member: {unsafe}")
 
-            last_err: Optional[Exception] = None
-            for _attempt in range(self._max_retries + 1):
-                try:
-                    if self._validate_crc:
-                        outp = self._extract_one_crc(m, self._extract_dir)
-                    else:
-                        outp = self._extract_one_raw(m, self._extract_dir)
-                    ok_paths.append(outp)
-                    last_err = None
-                    break
-                except Exception as e:
-                    last_err = e
-            if last_err is not None:
-                failed.append(m)
-                if self._on_error == "abort":
-                    raise RuntimeError(f"Error extracting {m}: {last_err}") from last_err
+        by_name = self._info_by_name
+
+        def offset(i: int) -> int:
+            zi = by_name.get(members[i])
+            return zi.header_offset if zi is not None else -1
 
+        run = sorted(safe, key=offset)
+        self._prefetch([members[i] for i in run])
+
+        # create every distinct parent directory up front (workers never race on makedirs)
+        if self._extract_dir and self._extract_format == "files":
+            for i in run:
+                self._dest_path(members[i], self._extract_dir)
+
+        futures: Dict[int, Future] = {}
+        if tf is None and self._workers > 1 and len(run) >= _PARALLEL_MIN_MEMBERS:
+            pool = self._get_pool()
+            futures = {i: pool.submit(self._extract_with_retries, members[i]) for i in run}
+
+        results: Dict[int, Tuple[Any, Optional[Exception]]] = {}
+        try:
+            for i in run:
+                outp, last_err = futures[i].result() if futures else self._extract_with_retries(members[i], tf)
+                if last_err is not None and self._on_error == "abort":
+                    raise RuntimeError(f"Error extracting {members[i]}: {last_err}") from last_err
+                results[i] = (outp, last_err)
+        finally:
+            for f in futures.values():
+                f.cancel()
+
+        for i, m in enumerate(members):
+            res = results.get(i)  # unsafe members have no result
+            if res is None or res[1] is not None:
+                failed.append(m)
+            else:
+                ok_paths.append(res[0])
         return ok_paths, failed
 
     # ---------- iterator protocol ----------
@@ -488,39 +1121,42 @@ class ZipNavigator(Iterator[List[str]]):
             raise RuntimeError("Call initialize_iterator() first")
         return self
 
-    def __next__(self) -> List[str]:
+    def __next__(self) -> List[Any]:
         if not self._iter_active or self._order is None:
             raise RuntimeError("Iterator not initialized")
         if self._cursor >= len(self._order):
             raise StopIteration
 
         start, end = self._cursor, min(self._cursor + self._batch_size, len(self._order))
-        batch = self._order[start:end]
+        names = self._names
+        batch = [names[i] for i in self._order[start:end]]
 
-        self._clear_extract_dir()
-        self._preflight_space(batch)
-        ok_paths, failed_now = self._extract_members(batch)
+        if self._extract_dir:
+            self._clear_extract_dir()
+            self._preflight_space(batch)
+        if self._extract_format == "tar":
+            # one tar per batch, written as member data arrives
+            tar_path = os.path.join(self._extract_dir, f"batch_{start:08d}.tar")
+            with tarfile.open(tar_path, "w") as tf:
+                added, failed_now = self._extract_members(batch, tf)
+            if added:
+                ok_paths = [os.path.abspath(tar_path)]
+            else:
+                os.remove(tar_path)
+                ok_paths = []
+        else:
+            ok_paths, failed_now = self._extract_members(batch)
 
         self._cursor = end
-        self._failed.extend(f for f in failed_now if f not in self._failed)
-
-        self._save_state(
-            self._state_path,
-            {
-                "zip_path": os.path.abspath(self.zip_path),
-                "base_at_init": self._base_at_init,
-                "order": self._order,
-                "cursor": self._cursor,
-                "batch_size": self._batch_size,
-                "extract_dir": os.path.abspath(self._extract_dir),
-                "seed": self._seed,
-                "extensions": sorted(self._extensions) if self._extensions else [],
-                "failed": list(self._failed),
-                "on_error": self._on_error,
-                "max_retries": self._max_retries,
-                "validate_crc": self._validate_crc,
-            },
-        )
+        new_failed: List[str] = []
+        for f in failed_now:
+            if f not in self._failed_set:
+                self._failed_set.add(f)
+                self._failed.append(f)
+                new_failed.append(f)
+
+        if self._state_path is not None:
+            self._append_state(self._state_path, {"cursor": self._cursor, "failed": new_failed})
         return ok_paths
 
     def iterator_status(self) -> Dict[str, Any]:
@@ -531,7 +1167,7 @@ class ZipNavigator(Iterator[List[str]]):
         remaining = max(total - done, 0)
         return {
             "active": True,
-            "zip": os.path.abspath(self.zip_path),
+            "zip": self._abs_zip_path,
             "base_at_init": self._base_at_init or "/",
             "batch_size": self._batch_size,
             "seed": self._seed,
@@ -546,16 +1182,17 @@ class ZipNavigator(Iterator[List[str]]):
             "error_policy": self._on_error,
             "max_retries": self._max_retries,
             "validate_crc": self._validate_crc,
+            "workers": self._workers,
+            "extract_format": self._extract_format,
         }
 
     def reset_iterator(self) -> None:
+        self._shutdown_pool()
+        self._free_reading = self._space_bound = None
         if self._extract_dir and os.path.isdir(self._extract_dir):
             self._clear_extract_dir()
-            if self._state_path and os.path.isfile(self._state_path):
-                try:
-                    os.remove(self._state_path)
-                except OSError:
-                    pass
+        if self._state_path:
+            self._remove_state_files(self._state_path)
         self._iter_active = False
         self._extract_dir = None
         self._state_path = None
@@ -566,39 +1203,92 @@ class ZipNavigator(Iterator[List[str]]):
         self._seed = None
         self._extensions = None
         self._failed = []
+        self._failed_set = set()
         self._on_error = "skip"
         self._max_retries = 1
         self._validate_crc = False
+        self._workers = 1
+        self._extract_format = "files"
 
     def resume_iterator(self, output_dir: str, extract_subdir: str = "extracted_zip") -> None:
         out_root = os.fspath(output_dir)
         extract_dir = os.path.join(out_root, extract_subdir)
-        state_path = os.path.join(extract_dir, ".zip_iter_state.json")
+        state_path = self._state_path_for(extract_dir)
         if not os.path.isfile(state_path):
             raise FileNotFoundError("No saved iterator state found.")
         state = self._load_state(state_path)
-        if state.get("zip_path") != os.path.abspath(self.zip_path):
+        if state.get("zip_path") != self._abs_zip_path:
             raise RuntimeError("State belongs to a different ZIP.")
         self._base_at_init = state.get("base_at_init", "")
         if self._cwd != self._base_at_init:
             self._cwd = self._base_at_init
-        self._order = state["order"]
+        self._order = self._load_order(state_path, state)
         self._cursor = int(state["cursor"])
         self._batch_size = int(state["batch_size"])
         self._seed = state.get("seed")
         exts = state.get("extensions", [])
         self._extensions = set(exts) if exts else None
         self._failed = list(state.get("failed", []))
+        self._failed_set = set(self._failed)
         self._on_error = state.get("on_error", "skip")
         self._max_retries = int(state.get("max_retries", 1))
         self._validate_crc = bool(state.get("validate_crc", False))
+        self._shutdown_pool()
+        self._free_reading = self._space_bound = None
+        self._workers = int(state.get("workers", 1))
+        self._extract_format = state.get("extract_format", "files")
         self._iter_active = True
         self._extract_dir = extract_dir
         self._state_path = state_path
 
     # ---------------- context manager ----------------
 
+    def _open_archive(self) -> None:
+        """Open the archive, its read-only mapping and the name -> ZipInfo table."""
+        self._zip = zipfile.ZipFile(self._abs_zip_path, "r")
+        self._mm = _map_readonly(self._zip.fp)   # None if the archive cannot be mapped
+        self._info_by_name: Dict[str, zipfile.ZipInfo] = self._zip.NameToInfo  # zipfile's own table
+        self._pid = os.getpid()
+
+    def _check_fork(self) -> None:
+        """
+        First use in a child of os.fork(): reopen the archive, whose inherited file offset is
+        shared with the parent, and drop the parent's pool, worker readers and log handle.
+        The read-only mapping stays valid. A failed reopen raises (and is retried on next use).
+        """
+        if self._pid == os.getpid():
+            return
+        self._zip = zipfile.ZipFile(self._abs_zip_path, "r")
+        self._pool = None
+        self._tls = threading.local()
+        self._worker_zips = []
+        self._log_fh = None  # parent and child must not interleave appends through one handle
+        self._pid = os.getpid()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        """Pickle without OS handles (archive, mapping, pool, state log); they are reopened on load."""
+        state = self.__dict__.copy()
+        for key in ("_zip", "_mm", "_info_by_name", "_pool", "_tls", "_worker_zips", "_log_fh"):
+            state.pop(key, None)
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._log_fh = None
+        self._pool = None
+        self._tls = threading.local()
+        self._worker_zips = []
+        self._open_archive()
+
     def close(self):
+        self._shutdown_pool()
+        self._close_state_log()
+        if self._mm is not None:
+            try:
+                self._mm.close()
+            except Exception:
+                pass
+            self._mm = None
         try:
             self._zip.close()
         except Exception:
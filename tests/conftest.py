@@ -1,36 +1,153 @@
 # tests/conftest.py
+import io
+import os
+import posixpath
+import shutil
+import sys
 import zipfile
 from pathlib import Path
 import pytest
 
+def pytest_configure(config):
+    # su Linux le cartelle temporanee dei test stanno in RAM (/dev/shm): i test dell'iteratore
+    # estraggono decine di file piccoli. --basetemp o PYTEST_DEBUG_TEMPROOT espliciti vincono.
+    if sys.platform.startswith("linux") and os.access("/dev/shm", os.W_OK):
+        os.environ.setdefault("PYTEST_DEBUG_TEMPROOT", "/dev/shm")
+
+@pytest.fixture(autouse=True)
+def _plenty_of_free_space(monkeypatch):
+    """Preflight deterministico: 1 TiB libero. I test del preflight ridefiniscono _free_space_bytes."""
+    monkeypatch.setattr("src.zipnavigator._free_space_bytes", lambda _p: 1 << 40)
+
+@pytest.fixture(scope="session")
+def zip_cache(tmp_path_factory) -> Path:
+    """Cartella di sessione: ogni zip di test viene compresso qui una volta sola."""
+    return tmp_path_factory.mktemp("zip_cache")
+
+def _cached(cache: Path, name: str, build) -> Path:
+    """
+    Costruisce cache/name solo alla prima richiesta della sessione: build(buf) scrive lo zip
+    in memoria, che poi finisce su disco con una sola scrittura.
+    """
+    src = cache / name
+    if not src.exists():
+        buf = io.BytesIO()
+        build(buf)
+        src.write_bytes(buf.getvalue())
+    return src
+
+def _copy_into(src: Path, tmp_path: Path) -> Path:
+    # copia, non hardlink: alcuni test corrompono o riscrivono lo zip
+    dst = tmp_path / src.name
+    shutil.copyfile(src, dst)
+    return dst
+
+def _build_sample(buf: io.BytesIO) -> None:
+    with zipfile.ZipFile(buf, "w", compression=zipfile.ZIP_DEFLATED) as z:
+        z.writestr("payload/data1.csv", "a,b,c\n1,2,3\n")
+        z.writestr("payload/data2.csv", "x,y,z\n4,5,6\n")
+        z.writestr("payload/sub/a.txt", "hello sub\n")
+        z.writestr("payload/sub/nested/b.bin", b"\x00\x01\x02\x03")
+        z.writestr("top.txt", "hello\n")
+        z.writestr("docs/readme.md", "# readme\n")
+
+def _build_three_csv(buf: io.BytesIO) -> None:
+    with zipfile.ZipFile(buf, "w", compression=zipfile.ZIP_DEFLATED) as z:
+        z.writestr("payload/a.csv", "a\n")
+        z.writestr("payload/b.csv", "b\n")
+        z.writestr("payload/c.csv", "c\n")
+
+def _build_small(buf: io.BytesIO) -> None:
+    """
+    Zip piccolo con struttura annidata:
+
+    /
+    ├─ a/
+    │  ├─ b/
+    │  │  └─ note.txt            ("hello from b")
+    │  └─ img.bin                (bytes)
+    ├─ top.txt                   ("root file")
+    └─ readme.md                 ("markdown")
+    """
+    with zipfile.ZipFile(buf, "w") as z:  # STORED: compression is not under test
+        z.writestr("a/b/note.txt", "hello from b\n")
+        z.writestr("a/img.bin", b"\x00\x01\x02\x03\x04\xff")
+        z.writestr("top.txt", "root file\n")
+        z.writestr("readme.md", "# readme\n")
+
+# zip "medium": decine di file in directory annidate, costruito una volta all'import
+_DEPTH = 3
+_MEDIUM_MEMBERS: dict[str, bytes] = {
+    # .txt block
+    **{f"data/text/part{i % _DEPTH}/file_{i}.txt": f"txt-{i}\n".encode() for i in range(20)},
+    # .md block
+    **{f"docs/section{j % _DEPTH}/doc_{j}.md": f"# doc {j}\n".encode() for j in range(10)},
+    # .bin block
+    **{f"bin/chunk{k % _DEPTH}/blob_{k}.bin": bytes([k % 256]) * (32 + k) for k in range(15)},
+    # extra deep chain
+    **{f"nested/l1/l2/l3/l4{t % 2}/deep_{t}.txt": f"deep-{t}\n".encode() for t in range(5)},
+    # mixed top-level
+    "README.md": b"# readme\n",
+    "top.txt": b"root file\n",
+}
+# always normalize to POSIX
+_MEDIUM_NAMES = frozenset(posixpath.normpath(n) for n in _MEDIUM_MEMBERS)
+
+def _build_medium(buf: io.BytesIO) -> None:
+    with zipfile.ZipFile(buf, "w") as z:  # STORED: compression is not under test
+        for name, data in _MEDIUM_MEMBERS.items():
+            z.writestr(name, data)
+
+def _build_corrupted(buf: io.BytesIO) -> None:
+    with zipfile.ZipFile(buf, "w") as z:  # STORED: i dati del membro sono in chiaro nell'archivio
+        z.writestr("ok.txt", b"all good\n")
+        z.writestr("corrupt/bad.txt", b"this will fail crc\n")
+    # il secondo membro fallisce il CRC: un byte invertito nei suoi dati
+    idx = buf.getvalue().find(b"this will fail crc\n")
+    with buf.getbuffer() as raw:
+        raw[idx] ^= 0xFF
+
+@pytest.fixture(scope="session")
+def sample_zip(zip_cache: Path) -> Path:
+    """Lo zip di esempio in cache, condiviso: solo per test che non lo modificano."""
+    return _cached(zip_cache, "sample.zip", _build_sample)
+
 @pytest.fixture
-def make_sample_zip(tmp_path: Path):
+def make_sample_zip(tmp_path: Path, sample_zip: Path):
     """
     Ritorna una factory che crea uno zip di esempio e ritorna il Path allo zip.
     Uso nei test: zf = make_sample_zip()
     """
     def _make() -> Path:
-        zpath = tmp_path / "sample.zip"
-        with zipfile.ZipFile(zpath, "w", compression=zipfile.ZIP_DEFLATED) as z:
-            z.writestr("payload/data1.csv", "a,b,c\n1,2,3\n")
-            z.writestr("payload/data2.csv", "x,y,z\n4,5,6\n")
-            z.writestr("payload/sub/a.txt", "hello sub\n")
-            z.writestr("payload/sub/nested/b.bin", b"\x00\x01\x02\x03")
-            z.writestr("top.txt", "hello\n")
-            z.writestr("docs/readme.md", "# readme\n")
-        return zpath
+        return _copy_into(sample_zip, tmp_path)
     return _make
 
 @pytest.fixture
-def make_three_csv_zip(tmp_path: Path):
+def make_three_csv_zip(tmp_path: Path, zip_cache: Path):
     """Factory per uno zip con tre CSV sotto payload/"""
     def _make() -> Path:
-        zpath = tmp_path / "three_csv.zip"
-        with zipfile.ZipFile(zpath, "w", compression=zipfile.ZIP_DEFLATED) as z:
-            z.writestr("payload/a.csv", "a\n")
-            z.writestr("payload/b.csv", "b\n")
-            z.writestr("payload/c.csv", "c\n")
-        return zpath
+        return _copy_into(_cached(zip_cache, "three_csv.zip", _build_three_csv), tmp_path)
+    return _make
+
+@pytest.fixture
+def make_small_zip(tmp_path: Path, zip_cache: Path):
+    """Factory per lo zip piccolo annidato (vedi _build_small)."""
+    def _make() -> Path:
+        return _copy_into(_cached(zip_cache, "small.zip", _build_small), tmp_path)
+    return _make
+
+@pytest.fixture
+def make_medium_zip(tmp_path: Path, zip_cache: Path):
+    """Factory per lo zip "medium": ritorna (zip_path, insieme di tutti i nomi dei membri)."""
+    def _make() -> tuple[Path, set[str]]:
+        return _copy_into(_cached(zip_cache, "medium.zip", _build_medium), tmp_path), set(_MEDIUM_NAMES)
+    return _make
+
+@pytest.fixture
+def make_zip_with_corrupted_member(tmp_path: Path, zip_cache: Path):
+    """Factory per lo zip con due membri, il secondo ("corrupt/bad.txt") con CRC errato."""
+    def _make() -> Path:
+        return _copy_into(_cached(zip_cache, "corrupt.zip", _build_corrupted), tmp_path)
     return _make
 
 @pytest.fixture
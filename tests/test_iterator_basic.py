@@ -1,5 +1,5 @@
 # tests/test_iterator_basic.py
-import os, sys, posixpath
+import os, sys, posixpath, zipfile
 from pathlib import Path
 
 
@@ -9,18 +9,17 @@ from src.zipnavigator import ZipNavigator  # noqa
 
 
 def _rel_from_out(out_dir: Path, extract_subdir: str, abs_path: str) -> str:
-    rel = os.path.relpath(abs_path, str(out_dir / extract_subdir)).replace(os.sep, "/")
-    return posixpath.normpath(rel)
+    # extracted paths are always os.path.join(out_dir/extract_subdir, member): strip the prefix
+    return abs_path[len(str(out_dir / extract_subdir)) + 1:].replace(os.sep, "/")
 
-def test_iterator_extract_csv_under_payload(make_sample_zip, tmp_path):
+def test_iterator_extract_csv_under_payload(make_sample_zip, outdir):
     zf = make_sample_zip()
-    out_dir = tmp_path / "out"; out_dir.mkdir()
     extract_subdir = "batch"
 
     with ZipNavigator(str(zf)) as nav:
         nav.cd("payload/")
         nav.initialize_iterator(
-            output_dir=str(out_dir),
+            output_dir=str(outdir),
             batch_size=10,
             extract_subdir=extract_subdir,
             reset=True,
@@ -34,10 +33,221 @@ def test_iterator_extract_csv_under_payload(make_sample_zip, tmp_path):
         seen = set()
         for batch in nav:
             for p in batch:
-                seen.add(_rel_from_out(out_dir, extract_subdir, p))
+                seen.add(_rel_from_out(outdir, extract_subdir, p))
 
         assert seen == {"payload/data1.csv", "payload/data2.csv"}
         st = nav.iterator_status()
         assert st["total_files"] == 2
         assert st["remaining"] == 0
         assert st["failed_so_far"] == 0
+
+def test_iterator_extracted_bytes_match_archive(make_sample_zip, outdir):
+    zf = make_sample_zip()
+
+    with ZipNavigator(str(zf)) as nav:
+        nav.initialize_iterator(
+            output_dir=str(outdir),
+            batch_size=3,
+            extract_subdir="batch",
+            reset=True,
+            seed=1,
+            max_retries=0,
+        )
+        for batch in nav:
+            for p in batch:
+                rel = _rel_from_out(outdir, "batch", p)
+                assert Path(p).read_bytes() == nav.cat("/" + rel, encoding=None)
+
+def test_iterator_parallel_workers_match_serial(make_sample_zip, tmp_path):
+    zf = make_sample_zip()
+    seqs = []
+    for workers in (1, 3):
+        out_dir = tmp_path / f"out{workers}"; out_dir.mkdir()
+        with ZipNavigator(str(zf)) as nav:
+            nav.initialize_iterator(
+                output_dir=str(out_dir),
+                batch_size=4,
+                extract_subdir="batch",
+                reset=True,
+                seed=7,
+                max_retries=0,
+                workers=workers,
+            )
+            seq = []
+            for batch in nav:
+                for p in batch:
+                    assert os.path.isfile(p)
+                    seq.append(_rel_from_out(out_dir, "batch", p))
+            assert nav.iterator_status()["workers"] == workers
+        seqs.append(seq)
+    assert seqs[0] == seqs[1]
+    assert len(seqs[0]) == 6
+
+def test_iterator_workers_after_chdir(make_sample_zip, tmp_path, outdir, monkeypatch):
+    # i worker aprono lo zip per percorso assoluto: un chdir dopo l'apertura non li rompe
+    zf = make_sample_zip()
+    monkeypatch.chdir(zf.parent)
+    with ZipNavigator(zf.name) as nav:
+        monkeypatch.chdir(outdir)
+        nav.initialize_iterator(output_dir=str(outdir), batch_size=10, reset=True, seed=0, workers=2)
+        assert sum(len(b) for b in nav) == 6
+
+def test_batch_read_in_offset_order_returned_in_batch_order(make_sample_zip, tmp_path):
+    zf = make_sample_zip()
+    with ZipNavigator(str(zf)) as nav:
+        nav.initialize_iterator(output_dir=str(tmp_path), batch_size=10, reset=True, seed=11, max_retries=0)
+        calls = []
+        orig = nav._extract_one_raw
+        def spy(member, out_root):
+            calls.append(member)
+            return orig(member, out_root)
+        nav._extract_one_raw = spy
+        order = [nav._names[i] for i in nav._order]
+        batch = next(nav)
+        offsets = [nav._zip.getinfo(m).header_offset for m in calls]
+        assert offsets == sorted(offsets)
+        assert [_rel_from_out(tmp_path, "extracted_zip", p) for p in batch] == order
+
+def test_iterator_workers_none_uses_cpu_count(make_sample_zip, tmp_path):
+    zf = make_sample_zip()
+    with ZipNavigator(str(zf)) as nav:
+        nav.initialize_iterator(output_dir=str(tmp_path), batch_size=10, reset=True, workers=None)
+        assert nav.iterator_status()["workers"] == (os.cpu_count() or 1)
+        assert sum(len(b) for b in nav) == 6
+
+def test_navigator_pickles_mid_iteration(make_sample_zip):
+    import pickle
+    zf = make_sample_zip()
+    with ZipNavigator(str(zf)) as nav:
+        nav.cd("payload/")
+        nav.initialize_iterator(output_dir=None, batch_size=2, seed=4)
+        next(nav)
+        with pickle.loads(pickle.dumps(nav)) as clone:
+            assert clone.pwd() == nav.pwd()
+            assert list(clone) == list(nav)  # same remaining batches, read through its own handle
+
+def test_navigator_unpickles_after_chdir(make_sample_zip, outdir, monkeypatch):
+    import pickle
+    zf = make_sample_zip()
+    monkeypatch.chdir(zf.parent)
+    with ZipNavigator(zf.name) as nav:
+        data = pickle.dumps(nav)
+    monkeypatch.chdir(outdir)  # il percorso relativo non punta più allo zip
+    with pickle.loads(data) as clone:
+        assert clone.is_file("top.txt")
+
+def test_iterator_without_mmap_reads_through_file(make_sample_zip, outdir):
+    zf = make_sample_zip()
+
+    with ZipNavigator(str(zf)) as nav:
+        nav._mm.close()
+        nav._mm = None  # simulate an archive that could not be mapped
+        nav.initialize_iterator(
+            output_dir=str(outdir),
+            batch_size=10,
+            extract_subdir="batch",
+            reset=True,
+            seed=3,
+            max_retries=0,
+            validate_crc=True,
+        )
+        batch = next(nav)
+        assert len(batch) == 6
+        assert nav.iterator_status()["failed_so_far"] == 0
+
+def test_iterator_in_memory_mode(make_sample_zip, tmp_path):
+    zf = make_sample_zip()
+
+    with ZipNavigator(str(zf)) as nav:
+        nav.cd("payload/")
+        nav.initialize_iterator(
+            output_dir=None,
+            batch_size=1,
+            seed=5,
+            extensions=[".csv"],
+            validate_crc=True,
+        )
+        got = {}
+        for batch in nav:
+            for name, data in batch:
+                got[name] = data
+
+        assert got == {
+            "payload/data1.csv": b"a,b,c\n1,2,3\n",
+            "payload/data2.csv": b"x,y,z\n4,5,6\n",
+        }
+        st = nav.iterator_status()
+        assert st["remaining"] == 0
+        assert st["state_file"] is None and st["extract_dir"] is None
+    assert list(tmp_path.iterdir()) == [zf]
+
+def test_extension_filter_matches_multi_part_suffix(tmp_path):
+    zpath = tmp_path / "archives.zip"
+    with zipfile.ZipFile(zpath, "w") as z:
+        z.writestr("a.tar.gz", b"a")
+        z.writestr("b.gz", b"b")
+        z.writestr("C.TAR.GZ", b"c")
+        z.writestr("d.txt", b"d")
+
+    with ZipNavigator(str(zpath)) as nav:
+        nav.initialize_iterator(output_dir=None, batch_size=10, seed=0, extensions=["tar.gz"])
+        names = {name for batch in nav for name, _ in batch}
+    assert names == {"a.tar.gz", "C.TAR.GZ"}
+
+def test_extension_filter_skips_dotfiles(tmp_path):
+    # come posixpath.splitext: ".txt" da solo è un dotfile senza estensione
+    zpath = tmp_path / "dotfiles.zip"
+    with zipfile.ZipFile(zpath, "w") as z:
+        z.writestr("dir/.txt", b"a")
+        z.writestr(".txt", b"b")
+        z.writestr("dir/..txt", b"c")
+        z.writestr("dir/a.txt", b"d")
+        z.writestr("dir/b..txt", b"e")
+
+    with ZipNavigator(str(zpath)) as nav:
+        nav.initialize_iterator(output_dir=None, batch_size=10, seed=0, extensions=[".txt"])
+        names = {name for batch in nav for name, _ in batch}
+    assert names == {"dir/a.txt", "dir/b..txt"}
+
+def test_iterator_stored_members_copied_intact(tmp_path, outdir):
+    zpath = tmp_path / "stored.zip"
+    big = bytes(range(256)) * 1024
+    with zipfile.ZipFile(zpath, "w", compression=zipfile.ZIP_STORED) as z:
+        z.writestr("blobs/big.bin", big)
+        z.writestr("blobs/small.bin", b"tiny")
+
+    with ZipNavigator(str(zpath)) as nav:
+        nav.initialize_iterator(output_dir=str(outdir), batch_size=10, seed=0, max_retries=0)
+        paths = next(nav)
+    got = {_rel_from_out(outdir, "extracted_zip", p): Path(p).read_bytes() for p in paths}
+    assert got == {"blobs/big.bin": big, "blobs/small.bin": b"tiny"}
+
+def test_iterator_tar_format_writes_one_archive_per_batch(make_sample_zip, outdir):
+    import tarfile
+    zf = make_sample_zip()
+
+    with ZipNavigator(str(zf)) as nav:
+        nav.initialize_iterator(
+            output_dir=str(outdir),
+            batch_size=4,
+            extract_subdir="batch",
+            reset=True,
+            seed=2,
+            max_retries=0,
+            extract_format="tar",
+        )
+        first = next(nav)
+        assert len(first) == 1 and first[0].endswith(".tar")
+        with tarfile.open(first[0]) as tf:
+            names = tf.getnames()
+            assert len(names) == 4
+            for name in names:
+                assert tf.extractfile(name).read() == nav.cat("/" + name, encoding=None)
+
+    with ZipNavigator(str(zf)) as nav2:
+        nav2.resume_iterator(str(outdir), extract_subdir="batch")
+        assert nav2.iterator_status()["extract_format"] == "tar"
+        (last,) = next(nav2)
+        assert not os.path.exists(first[0])  # previous batch cleared
+        with tarfile.open(last) as tf:
+            assert len(tf.getnames()) == 2
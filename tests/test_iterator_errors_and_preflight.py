@@ -1,5 +1,5 @@
 # tests/test_iterator_errors_and_preflight.py
-import os, sys, types
+import mmap, os, sys, types
 from pathlib import Path
 
 import pytest
@@ -9,63 +9,85 @@ from src.zipnavigator import ZipNavigator  # noqa
 
 
 
+@pytest.fixture
+def init_kwargs(outdir):
+    """Argomenti comuni di initialize_iterator: i test cambiano solo quello che provano."""
+    return dict(
+        output_dir=str(outdir),
+        batch_size=10,
+        extract_subdir="b",
+        reset=True,
+        seed=0,
+        extensions=[".csv"],
+        on_error="skip",
+        max_retries=0,
+        validate_crc=False,
+    )
+
+
 def _rel(abs_path: str, out_dir: Path, sub: str) -> str:
-    return os.path.relpath(abs_path, str(out_dir / sub)).replace(os.sep, "/")
+    # extracted paths are always os.path.join(out_dir/sub, member): strip the prefix
+    return abs_path[len(str(out_dir / sub)) + 1:].replace(os.sep, "/")
 
 
-def test_preflight_space_failure(make_sample_zip, tmp_path, monkeypatch):
+def test_preflight_space_failure(make_sample_zip, monkeypatch, init_kwargs):
     zf = make_sample_zip()
-    out_dir = tmp_path / "o"; out_dir.mkdir()
 
     # forza spazio libero ~ 0
     monkeypatch.setattr(zn, "_free_space_bytes", lambda _: 0)
 
     with ZipNavigator(str(zf)) as nav:
         nav.cd("payload/")
-        nav.initialize_iterator(
-            output_dir=str(out_dir),
-            batch_size=10,
-            extract_subdir="b",
-            reset=True,
-            seed=0,
-            extensions=[".csv"],
-            on_error="skip",
-            max_retries=0,
-            validate_crc=False,
-        )
+        nav.initialize_iterator(**init_kwargs)
         with pytest.raises(RuntimeError, match="Insufficient free space"):
             next(nav)
 
 
-def test_on_error_skip_continues(make_sample_zip, tmp_path, monkeypatch):
+def test_preflight_reuses_free_space_reading(make_sample_zip, tmp_path, monkeypatch):
+    zf = make_sample_zip()
+    calls = []
+    monkeypatch.setattr(zn, "_free_space_bytes", lambda p: calls.append(p) or 10**15)
+
+    with ZipNavigator(str(zf)) as nav:
+        nav.initialize_iterator(output_dir=str(tmp_path), batch_size=1, reset=True, seed=0)
+        assert sum(len(b) for b in nav) == 6
+    assert len(calls) == 1  # one reading covers all six batches
+
+
+def _fail_data1(orig):
+    # fallisce solo l'estrazione di data1.csv
+    def failing(member, out_root):
+        if member.endswith("data1.csv"):
+            raise RuntimeError("boom")
+        return orig(member, out_root)
+    return failing
+
+
+def _fail_always(orig):
+    def _always_fail(*a, **k):
+        raise RuntimeError("boom")
+    return _always_fail
+
+
+@pytest.mark.parametrize("on_error, make_patch, expected_exc", [
+    ("skip", _fail_data1, None),            # con skip, restituisce i successi
+    ("abort", _fail_always, RuntimeError),  # con abort, il primo errore interrompe il batch
+])
+def test_on_error_policy(make_sample_zip, init_kwargs, outdir, on_error, make_patch, expected_exc):
     zf = make_sample_zip()
-    out_dir = tmp_path / "o"; out_dir.mkdir()
 
     with ZipNavigator(str(zf)) as nav:
         nav.cd("payload/")
-        nav.initialize_iterator(
-            output_dir=str(out_dir),
-            batch_size=10,
-            extract_subdir="b",
-            reset=True,
-            seed=0,
-            extensions=[".csv"],
-            on_error="skip",
-            max_retries=0,
-            validate_crc=False,
-        )
+        nav.initialize_iterator(**{**init_kwargs, "on_error": on_error})
+        nav._extract_one_raw = make_patch(nav._extract_one_raw)  # type: ignore
 
-        # monkeypatch: fallisce estrazione di data1.csv
-        orig = nav._extract_one_raw
-        def failing(member, out_root):
-            if member.endswith("data1.csv"):
-                raise RuntimeError("boom")
-            return orig(member, out_root)
-        nav._extract_one_raw = failing  # type: ignore
+        if expected_exc is not None:
+            with pytest.raises(expected_exc, match="Error extracting"):
+                next(nav)
+            return
 
         batch = next(nav)  # estrae batch con uno che fallisce
-        # con skip, restituisce i successi
-        rels = {_rel(p, out_dir, "b") for p in batch}
+        rels = {_rel(p, outdir, "b") for p in batch}
         assert rels == {"payload/data2.csv"}  # solo il secondo presente
 
         st = nav.iterator_status()
@@ -73,46 +95,38 @@ def test_on_error_skip_continues(make_sample_zip, tmp_path, monkeypatch):
         assert st["remaining"] == 0
 
 
-def test_on_error_abort_raises(make_sample_zip, tmp_path, monkeypatch):
+def test_retries_only_transient_errors(make_sample_zip, monkeypatch, init_kwargs, outdir):
     zf = make_sample_zip()
-    out_dir = tmp_path / "o"; out_dir.mkdir()
+    sleeps = []
+    monkeypatch.setattr(zn.time, "sleep", sleeps.append)
 
     with ZipNavigator(str(zf)) as nav:
         nav.cd("payload/")
-        nav.initialize_iterator(
-            output_dir=str(out_dir),
-            batch_size=10,
-            extract_subdir="b",
-            reset=True,
-            seed=0,
-            extensions=[".csv"],
-            on_error="abort",   # <---
-            max_retries=0,
-            validate_crc=False,
-        )
-        # fallisci sempre
-        nav._extract_one_raw = lambda *a, **k: (_ for _ in ()).throw(RuntimeError("boom"))  # type: ignore
-        with pytest.raises(RuntimeError, match="Error extracting"):
-            next(nav)
+        nav.initialize_iterator(**{**init_kwargs, "max_retries": 3})
+        calls = {}
+        orig = nav._extract_one_raw
+        def flaky(member, out_root):
+            calls[member] = calls.get(member, 0) + 1
+            if member.endswith("data1.csv"):
+                raise zn.zipfile.BadZipFile("corrupt")      # non ritentato
+            if calls[member] < 3:
+                raise OSError(28, "No space left on device")  # transitorio
+            return orig(member, out_root)
+        nav._extract_one_raw = flaky  # type: ignore
 
+        batch = next(nav)
+        assert [_rel(p, outdir, "b") for p in batch] == ["payload/data2.csv"]
+        assert calls == {"payload/data1.csv": 1, "payload/data2.csv": 3}
+        # backoff esponenziale con jitter: 0.1s e 0.2s, ciascuno scalato in [0.5, 1.5)
+        assert len(sleeps) == 2 and 0.05 <= sleeps[0] < 0.15 and 0.1 <= sleeps[1] < 0.3
 
-def test_validate_crc_path_is_used(make_sample_zip, tmp_path, monkeypatch):
+
+def test_validate_crc_path_is_used(make_sample_zip, monkeypatch, init_kwargs):
     zf = make_sample_zip()
-    out_dir = tmp_path / "o"; out_dir.mkdir()
 
     with ZipNavigator(str(zf)) as nav:
         nav.cd("payload/")
-        nav.initialize_iterator(
-            output_dir=str(out_dir),
-            batch_size=10,
-            extract_subdir="b",
-            reset=True,
-            seed=0,
-            extensions=[".csv"],
-            on_error="skip",
-            max_retries=0,
-            validate_crc=True,   # <--- attiva percorso CRC
-        )
+        nav.initialize_iterator(**{**init_kwargs, "validate_crc": True})  # <--- attiva percorso CRC
 
         called = {"crc": 0}
         orig_crc = nav._extract_one_crc
@@ -121,5 +135,142 @@ def test_validate_crc_path_is_used(make_sample_zip, tmp_path, monkeypatch):
             return orig_crc(member, out_root)
         nav._extract_one_crc = spy_crc  # type: ignore
 
-        list(iter(nav))  # consuma tutto
+        for _ in nav:  # consuma tutto
+            pass
         assert called["crc"] == 2  # due csv
+
+
+def test_large_member_stream_path_checks_crc(tmp_path, monkeypatch, outdir):
+    # force the fused inflate+CRC stream with tiny steps
+    monkeypatch.setattr(zn, "_ONESHOT_MAX_BYTES", 16)
+    monkeypatch.setattr(zn, "_STREAM_CHUNK", 7)
+    payload = b"".join(b"line %d\n" % i for i in range(500))
+    zpath = tmp_path / "big.zip"
+    import zipfile
+    with zipfile.ZipFile(zpath, "w") as z:
+        z.writestr("d/deflated.txt", payload, compress_type=zipfile.ZIP_DEFLATED)
+        z.writestr("d/stored.txt", payload, compress_type=zipfile.ZIP_STORED)
+
+    with ZipNavigator(str(zpath)) as nav:
+        nav.initialize_iterator(
+            output_dir=str(outdir), batch_size=10, extract_subdir="b",
+            seed=0, max_retries=0, validate_crc=True,
+        )
+        paths = next(nav)
+        assert len(paths) == 2
+        assert all(Path(p).read_bytes() == payload for p in paths)
+
+    # flip one byte of the STORED copy: the streamed CRC must catch it
+    with open(zpath, "r+b") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_WRITE) as mm:
+        idx = mm.rfind(b"line 250\n")
+        mm[idx] ^= 0xFF
+    with ZipNavigator(str(zpath)) as nav:
+        nav.initialize_iterator(
+            output_dir=str(outdir), batch_size=10, extract_subdir="b", reset=True,
+            seed=0, max_retries=0, validate_crc=True,
+        )
+        next(nav)
+        assert nav.iterator_status()["failed_tail"] == ["d/stored.txt"]
+
+
+def test_stream_path_stops_at_declared_size(tmp_path, monkeypatch, outdir):
+    # un file_size sottostimato: lo stream si ferma lì, come ZipExtFile, e non lascia file parziali
+    monkeypatch.setattr(zn, "_ONESHOT_MAX_BYTES", 16)
+    monkeypatch.setattr(zn, "_STREAM_CHUNK", 64)
+    import zipfile
+    zpath = tmp_path / "liar.zip"
+    with zipfile.ZipFile(zpath, "w") as z:
+        z.writestr("d/big.txt", b"x" * 100_000, compress_type=zipfile.ZIP_DEFLATED)
+        z.writestr("d/raw.txt", b"y" * 1_000, compress_type=zipfile.ZIP_STORED)
+    written = []
+    orig_write_all = zn._write_all
+    monkeypatch.setattr(zn, "_write_all", lambda fd, data: (written.append(len(data)), orig_write_all(fd, data)))
+
+    with ZipNavigator(str(zpath)) as nav:
+        for zi in nav._info_by_name.values():
+            zi.file_size = 100
+        nav.initialize_iterator(
+            output_dir=str(outdir), batch_size=10, extract_subdir="b", seed=0, max_retries=0, validate_crc=True,
+        )
+        assert next(nav) == []
+        assert sorted(nav.iterator_status()["failed_tail"]) == ["d/big.txt", "d/raw.txt"]
+    assert sum(written) <= 2 * 100
+    assert not any((outdir / "b" / "d").iterdir())
+
+
+def _zip_with_corrupt_member(tmp_path: Path) -> Path:
+    # STORED, so the flipped byte reaches the data unchanged (no inflate error to hide the CRC)
+    import zipfile
+    zpath = tmp_path / "corrupt.zip"
+    with zipfile.ZipFile(zpath, "w") as z:
+        z.writestr("d/good.csv", "good,row\n")
+        z.writestr("d/bad.csv", "bad,row\n")
+    with open(zpath, "r+b") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_WRITE) as mm:
+        mm[mm.find(b"bad,row\n")] ^= 0xFF
+    return zpath
+
+
+@pytest.mark.parametrize("sendfile", [False, True])
+def test_corrupt_member_fails_without_validate_crc(tmp_path, monkeypatch, init_kwargs, sendfile):
+    # validate_crc=False sceglie solo il percorso veloce: il CRC resta controllato
+    if not sendfile:
+        monkeypatch.setattr(zn, "_HAS_FILE_SENDFILE", False)
+    with ZipNavigator(str(_zip_with_corrupt_member(tmp_path))) as nav:
+        nav.initialize_iterator(**init_kwargs)
+        batch = next(nav)
+        assert [_rel(p, Path(init_kwargs["output_dir"]), "b") for p in batch] == ["d/good.csv"]
+        assert nav.iterator_status()["failed_tail"] == ["d/bad.csv"]
+
+
+def test_corrupt_member_fails_in_memory(tmp_path, init_kwargs):
+    with ZipNavigator(str(_zip_with_corrupt_member(tmp_path))) as nav:
+        nav.initialize_iterator(**{**init_kwargs, "output_dir": None})
+        assert [m for m, _ in next(nav)] == ["d/good.csv"]
+        assert nav.iterator_status()["failed_tail"] == ["d/bad.csv"]
+
+
+def test_corrupt_member_left_out_of_tar_batch(tmp_path, init_kwargs):
+    import tarfile
+    with ZipNavigator(str(_zip_with_corrupt_member(tmp_path))) as nav:
+        nav.initialize_iterator(**{**init_kwargs, "extract_format": "tar"})
+        (tar_path,) = next(nav)
+        with tarfile.open(tar_path) as tf:
+            assert tf.getnames() == ["d/good.csv"]
+        assert nav.iterator_status()["failed_tail"] == ["d/bad.csv"]
+
+
+def test_tar_mode_streams_large_members(tmp_path, monkeypatch, init_kwargs):
+    # membri "grandi": mai letti interi con ZipFile.read; quello corrotto viene tolto dal tar
+    import tarfile, zipfile
+    monkeypatch.setattr(zn, "_ONESHOT_MAX_BYTES", 16)
+    monkeypatch.setattr(zipfile.ZipFile, "read", lambda *a, **k: pytest.fail("member read whole"))
+    payload = {f"d/{c}.csv": (c * 5000).encode() for c in "abc"}
+    zpath = tmp_path / "large.zip"
+    with zipfile.ZipFile(zpath, "w") as z:
+        for name, data in payload.items():
+            stored = name == "d/b.csv"  # STORED: il byte corrotto resta nei dati
+            z.writestr(name, data, compress_type=zipfile.ZIP_STORED if stored else zipfile.ZIP_DEFLATED)
+    with open(zpath, "r+b") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_WRITE) as mm:
+        mm[mm.find(b"bbbb") + 4000] ^= 0xFF  # CRC error only at the end of the stream
+
+    with ZipNavigator(str(zpath)) as nav:
+        nav.initialize_iterator(**{**init_kwargs, "extract_format": "tar"})
+        (tar_path,) = next(nav)
+        with tarfile.open(tar_path) as tf:
+            assert tf.getnames() == ["d/a.csv", "d/c.csv"]
+            for name in tf.getnames():
+                assert tf.extractfile(name).read() == payload[name]
+        assert nav.iterator_status()["failed_tail"] == ["d/b.csv"]
+
+
+def test_unsafe_members_are_never_iterated(tmp_path):
+    import zipfile
+    zpath = tmp_path / "evil.zip"
+    with zipfile.ZipFile(zpath, "w") as z:
+        z.writestr("ok.txt", "fine\n")
+        z.writestr("sub/../../escape.txt", "nope\n")
+        z.writestr("C:/win.txt", "nope\n")
+        z.writestr("sub/a..b.txt", "dots in a name are fine\n")
+    with ZipNavigator(str(zpath)) as nav:
+        nav.initialize_iterator(output_dir=None, batch_size=10, seed=0)
+        assert sorted(m for b in nav for m, _ in b) == ["ok.txt", "sub/a..b.txt"]
@@ -1,15 +1,13 @@
 # tests/test_iterator_seed_and_state.py
-import os, sys
+import os, struct, sys
 from pathlib import Path
 
 from src.zipnavigator import ZipNavigator  # noqa
 
 
 def _collect_basenames(batches):
-    out = []
-    for batch in batches:
-        out.extend([os.path.basename(p).replace(os.sep, "/") for p in batch])
-    return out
+    # accetta anche il navigator stesso: consuma un batch alla volta
+    return [os.path.basename(p) for batch in batches for p in batch]
 
 def test_seed_deterministic_order(make_three_csv_zip, tmp_path):
     zf = make_three_csv_zip()
@@ -31,19 +29,18 @@ def test_seed_deterministic_order(make_three_csv_zip, tmp_path):
                 max_retries=0,
                 validate_crc=False,
             )
-        seq1 = _collect_basenames(list(iter(nav1)))
-        seq2 = _collect_basenames(list(iter(nav2)))
+        seq1 = _collect_basenames(nav1)
+        seq2 = _collect_basenames(nav2)
         assert seq1 == seq2 and set(seq1) == {"a.csv", "b.csv", "c.csv"}
 
-def test_resume_and_reset(make_three_csv_zip, tmp_path):
+def test_resume_and_reset(make_three_csv_zip, outdir):
     zf = make_three_csv_zip()
-    out_dir = tmp_path / "out"; out_dir.mkdir()
 
     # step 1: estrai un batch e lascia stato
     with ZipNavigator(str(zf)) as nav:
         nav.cd("payload/")
         nav.initialize_iterator(
-            output_dir=str(out_dir),
+            output_dir=str(outdir),
             batch_size=1,
             extract_subdir="b",
             reset=True,
@@ -61,9 +58,10 @@ def test_resume_and_reset(make_three_csv_zip, tmp_path):
 
     # step 2: nuovo oggetto, riprende
     with ZipNavigator(str(zf)) as nav2:
-        nav2.resume_iterator(str(out_dir), extract_subdir="b")
+        nav2.resume_iterator(str(outdir), extract_subdir="b")
         # completa
-        rest = list(iter(nav2))
+        for _ in nav2:
+            pass
         st2 = nav2.iterator_status()
         assert st2["remaining"] == 0
         assert st2["extracted_so_far"] == st2["total_files"]
@@ -72,3 +70,123 @@ def test_resume_and_reset(make_three_csv_zip, tmp_path):
         nav2.reset_iterator()
         assert not state_file.exists()
         assert nav2.iterator_status()["active"] is False
+
+def test_state_header_written_once_and_log_replayed(make_three_csv_zip, outdir):
+    zf = make_three_csv_zip()
+
+    with ZipNavigator(str(zf)) as nav:
+        nav.cd("payload/")
+        nav.initialize_iterator(
+            output_dir=str(outdir),
+            batch_size=1,
+            extract_subdir="b",
+            reset=True,
+            seed=9,
+            extensions=[".csv"],
+            max_retries=0,
+        )
+        state_file = Path(nav.iterator_status()["state_file"])
+        header = state_file.read_bytes()
+        next(nav)
+        log_fh = nav._log_fh
+        next(nav)
+        assert nav._log_fh is log_fh  # the log is opened once, not per batch
+        # per-batch progress goes to the log, the header is untouched
+        assert state_file.read_bytes() == header
+        log_file = state_file.with_suffix(".log")
+        assert len(log_file.read_text(encoding="utf-8").splitlines()) == 2
+    assert log_fh.closed
+
+    # an interrupted append leaves a torn line: it is ignored on resume
+    with open(log_file, "a", encoding="utf-8") as f:
+        f.write('{"cursor": 3, "fai')
+
+    with ZipNavigator(str(zf)) as nav2:
+        nav2.resume_iterator(str(outdir), extract_subdir="b")
+        assert nav2.iterator_status()["extracted_so_far"] == 2
+        assert not log_file.exists()  # torn log folded back into the header
+        assert len(next(nav2)) == 1
+        nav2.reset_iterator()
+    assert not state_file.exists() and not log_file.exists()
+
+def test_order_saved_once_as_index_file(make_three_csv_zip, outdir):
+    zf = make_three_csv_zip()
+
+    with ZipNavigator(str(zf)) as nav:
+        nav.cd("payload/")
+        nav.initialize_iterator(
+            output_dir=str(outdir), batch_size=1, extract_subdir="b", reset=True, seed=5, extensions=[".csv"]
+        )
+        state_file = Path(nav.iterator_status()["state_file"])
+        order_file = state_file.with_suffix(".order")
+        assert order_file.stat().st_size == 3 * 4  # one uint32 index per member
+        assert order_file.read_bytes() == struct.pack("<3I", *nav._order)  # little-endian everywhere
+        assert '"order"' not in state_file.read_text(encoding="utf-8")
+        first = _collect_basenames([next(nav)])
+
+    with ZipNavigator(str(zf)) as nav2:
+        nav2.resume_iterator(str(outdir), extract_subdir="b")
+        rest = _collect_basenames(nav2)
+        assert sorted(first + rest) == ["a.csv", "b.csv", "c.csv"]
+        nav2.reset_iterator()
+    assert not order_file.exists()
+
+def test_order_file_is_little_endian_on_big_endian_hosts(make_three_csv_zip, outdir, monkeypatch):
+    zf = make_three_csv_zip()
+    monkeypatch.setattr(sys, "byteorder", "big")  # simula un host big-endian: i byte vanno invertiti
+    with ZipNavigator(str(zf)) as nav:
+        nav.initialize_iterator(
+            output_dir=str(outdir), batch_size=1, extract_subdir="b", reset=True, seed=5, extensions=[".csv"]
+        )
+        order = list(nav._order)
+        order_file = Path(nav.iterator_status()["state_file"]).with_suffix(".order")
+        assert order_file.read_bytes() == struct.pack(">3I", *order)
+    with ZipNavigator(str(zf)) as nav2:
+        nav2.resume_iterator(str(outdir), extract_subdir="b")
+        assert list(nav2._order) == order
+
+def test_state_kept_outside_extract_dir_and_old_location_migrated(make_three_csv_zip, outdir):
+    zf = make_three_csv_zip()
+
+    with ZipNavigator(str(zf)) as nav:
+        nav.cd("payload/")
+        nav.initialize_iterator(output_dir=str(outdir), batch_size=1, extract_subdir="b", reset=True, seed=1)
+        next(nav)
+        state_file = Path(nav.iterator_status()["state_file"])
+        assert state_file == outdir / ".b.zip_iter_state.json"
+
+    # put the state back where older versions kept it (inside the extraction folder)
+    old = outdir / "b" / ".zip_iter_state.json"
+    for suffix in (".json", ".log", ".order"):
+        state_file.with_suffix(suffix).replace(old.with_suffix(suffix))
+
+    with ZipNavigator(str(zf)) as nav2:
+        nav2.resume_iterator(str(outdir), extract_subdir="b")
+        assert nav2.iterator_status()["extracted_so_far"] == 1
+        assert state_file.is_file() and not old.exists()
+        assert len(list(nav2)) == 2
+
+def test_log_left_after_header_fold_replays_cleanly(make_three_csv_zip, outdir):
+    import json
+    zf = make_three_csv_zip()
+
+    with ZipNavigator(str(zf)) as nav:
+        nav.cd("payload/")
+        nav.initialize_iterator(
+            output_dir=str(outdir), batch_size=1, extract_subdir="b", reset=True, seed=3, extensions=[".csv"]
+        )
+        next(nav)
+        state_file = Path(nav.iterator_status()["state_file"])
+    log_file = state_file.with_suffix(".log")
+    with open(log_file, "a", encoding="utf-8") as f:
+        f.write('{"cursor":2,"failed":["payload/b.csv"]}\n')
+
+    # crash tra os.replace dell'header e la rimozione del log: l'header contiene già il log
+    header = json.loads(state_file.read_text(encoding="utf-8"))
+    header.update(cursor=2, failed=["payload/b.csv"])
+    state_file.write_text(json.dumps(header), encoding="utf-8")
+
+    with ZipNavigator(str(zf)) as nav2:
+        nav2.resume_iterator(str(outdir), extract_subdir="b")
+        st = nav2.iterator_status()
+        assert st["extracted_so_far"] == 2 and st["failed_so_far"] == 1
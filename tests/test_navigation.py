@@ -2,64 +2,82 @@
 import os, sys, posixpath
 from pathlib import Path
 
+import pytest
+
 
 
 from src.zipnavigator import ZipNavigator  # noqa
 
 
+@pytest.fixture(scope="module")
+def _shared_nav(sample_zip):
+    # test di sola lettura: un solo navigator (e un solo parse della central directory) per modulo
+    with ZipNavigator(str(sample_zip)) as nav:
+        yield nav
+
+
+@pytest.fixture
+def nav(_shared_nav):
+    _shared_nav.cd("/")  # ogni test parte dalla root
+    return _shared_nav
+
+
+def test_ls_root_and_recursive(nav):
+    root = set(nav.ls())
+    # directory implicite con '/' + un file
+    assert "payload/" in root
+    assert "docs/" in root
+    assert "top.txt" in root
+
+    rec = set(nav.ls(recursive=True))
+    # devono comparire file e dir (le dir con '/')
+    assert "payload/" in rec
+    assert "payload/sub/" in rec
+    assert "payload/sub/nested/" in rec
+    assert "payload/data1.csv" in rec
+    assert "payload/sub/a.txt" in rec
+    assert "payload/sub/nested/b.bin" in rec
+    assert "docs/readme.md" in rec
+    assert "top.txt" in rec
+
+
+def test_cd_with_and_without_trailing_slash(nav):
+    # senza slash
+    nav.cd("payload")
+    assert nav.pwd().endswith("/payload/")
+    # con slash
+    nav.cd("sub/")
+    assert nav.pwd().endswith("/payload/sub/")
+
+
+def test_exists_is_dir_is_file(nav):
+    assert nav.exists("payload")  # dir implicite tollerate
+    assert nav.is_dir("payload")  # True anche senza '/'
+    assert nav.exists("payload/")
+    assert nav.is_dir("payload/")
+
+    assert nav.exists("top.txt")
+    assert nav.is_file("top.txt")
+    assert not nav.is_dir("top.txt")
+
+    assert not nav.exists("nope/")
+    assert not nav.exists("nope.txt")
+    assert not nav.is_dir("nope") and not nav.is_dir("nope/")
+
+
+def test_ls_tolerant_argument_without_slash(nav):
+    # ls("payload") deve funzionare anche senza "/"
+    listing = set(nav.ls("payload"))
+    assert "payload/data1.csv" in listing
+    assert "payload/data2.csv" in listing
+
 
-def test_ls_root_and_recursive(make_sample_zip):
-    zf = make_sample_zip()
-    with ZipNavigator(str(zf)) as nav:
-        root = set(nav.ls())
-        # directory implicite con '/' + un file
-        assert "payload/" in root
-        assert "docs/" in root
-        assert "top.txt" in root
-
-        rec = set(nav.ls(recursive=True))
-        # devono comparire file e dir (le dir con '/')
-        assert "payload/" in rec
-        assert "payload/sub/" in rec
-        assert "payload/sub/nested/" in rec
-        assert "payload/data1.csv" in rec
-        assert "payload/sub/a.txt" in rec
-        assert "payload/sub/nested/b.bin" in rec
-        assert "docs/readme.md" in rec
-        assert "top.txt" in rec
-
-
-def test_cd_with_and_without_trailing_slash(make_sample_zip):
-    zf = make_sample_zip()
-    with ZipNavigator(str(zf)) as nav:
-        # senza slash
-        nav.cd("payload")
-        assert nav.pwd().endswith("/payload/")
-        # con slash
-        nav.cd("sub/")
-        assert nav.pwd().endswith("/payload/sub/")
-
-
-def test_exists_is_dir_is_file(make_sample_zip):
-    zf = make_sample_zip()
-    with ZipNavigator(str(zf)) as nav:
-        assert nav.exists("payload")  # _zpath tollera dir implicite
-        assert nav.is_dir("payload")  # True anche senza '/'
-        assert nav.exists("payload/")
-        assert nav.is_dir("payload/")
-
-        assert nav.exists("top.txt")
-        assert nav.is_file("top.txt")
-        assert not nav.is_dir("top.txt")
-
-        assert not nav.exists("nope/")
-        assert not nav.exists("nope.txt")
-
-
-def test_ls_tolerant_argument_without_slash(make_sample_zip):
-    zf = make_sample_zip()
-    with ZipNavigator(str(zf)) as nav:
-        # ls("payload") deve funzionare grazie a _zpath tollerante
-        listing = set(nav.ls("payload"))
-        assert "payload/data1.csv" in listing
-        assert "payload/data2.csv" in listing
+def test_ls_missing_or_file_raises(nav):
+    assert nav.exists("/")
+    with pytest.raises(FileNotFoundError):
+        nav.ls("nope")
+    with pytest.raises(FileNotFoundError):
+        nav.ls("payload/missing/")
+    with pytest.raises(NotADirectoryError):
+        nav.ls("top.txt")
+    assert nav.ls("payload/sub") == ["payload/sub/a.txt", "payload/sub/nested/"]
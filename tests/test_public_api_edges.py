@@ -2,6 +2,8 @@
 import os, sys
 from pathlib import Path
 
+import pytest
+
 from src.zipnavigator import ZipNavigator  # noqa
 
 
@@ -14,3 +16,33 @@ def test_pwd_root_and_change(make_sample_zip):
         assert nav.pwd().endswith("/docs/")
         nav.cd("")  # torna a root
         assert nav.pwd() == "/"
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="os.fork non disponibile")
+def test_fork_child_reopens_archive_on_first_use(make_sample_zip):
+    zf = make_sample_zip()
+    with ZipNavigator(str(zf)) as nav:
+        parent_zip = nav._zip
+        pid = os.fork()
+        if pid == 0:  # figlio: riapre lo zip solo al primo uso, il file offset non è condiviso
+            ok = False
+            try:
+                ok = nav._zip is parent_zip and nav._reader() is not parent_zip
+                ok = ok and nav.cat("top.txt") == "hello\n"
+            finally:
+                os._exit(0 if ok else 1)
+        _, status = os.waitpid(pid, 0)
+        assert os.waitstatus_to_exitcode(status) == 0
+        assert nav._reader() is parent_zip
+
+
+def test_name_tables_follow_zip_changes(make_sample_zip):
+    import zipfile
+    zf = make_sample_zip()
+    with ZipNavigator(str(zf)) as a:
+        assert not a.exists("new/extra.txt")
+
+    with zipfile.ZipFile(zf, "a") as z:
+        z.writestr("new/extra.txt", "x\n")
+    with ZipNavigator(str(zf)) as c:  # tabelle ricostruite a ogni apertura
+        assert c.is_dir("new/") and c.is_file("new/extra.txt")
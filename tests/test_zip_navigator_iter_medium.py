@@ -1,8 +1,8 @@
 # tests/test_zip_navigator_iter_medium.py
+import mmap
 import os
 import sys
 import zipfile
-import posixpath
 from pathlib import Path
 
 import pytest
@@ -10,66 +10,27 @@ import pytest
 from src.zipnavigator import ZipNavigator
 
 
-# ---------------------- helpers to create ZIPs ----------------------
+# ---------------------- helpers ----------------------
 
-def make_medium_zip(tmp_path: Path, depth: int = 3) -> tuple[Path, set[str]]:
-    """
-    Create a "medium" zip with dozens of files and nested directories.
-    Returns (zip_path, set_of_all_member_names).
-    """
-    zpath = tmp_path / "medium.zip"
-    members = set()
-
-    def add(z: zipfile.ZipFile, name: str, data: bytes):
-        z.writestr(name, data)
-        # always normalize to POSIX
-        members.add(posixpath.normpath(name))
-
-    with zipfile.ZipFile(zpath, "w", compression=zipfile.ZIP_DEFLATED) as z:
-        # .txt block
-        for i in range(20):
-            add(z, f"data/text/part{i % depth}/file_{i}.txt", f"txt-{i}\n".encode())
-
-        # .md block
-        for j in range(10):
-            add(z, f"docs/section{j % depth}/doc_{j}.md", f"# doc {j}\n".encode())
-
-        # .bin block
-        for k in range(15):
-            add(z, f"bin/chunk{k % depth}/blob_{k}.bin", bytes([k % 256]) * (32 + k))
+_TEXT_EXTS = (".txt", ".md")  # the filter the iteration tests pass to initialize_iterator
 
-        # extra deep chain
-        for t in range(5):
-            add(z, f"nested/l1/l2/l3/l4{t % 2}/deep_{t}.txt", f"deep-{t}\n".encode())
 
-        # mixed top-level
-        add(z, "README.md", b"# readme\n")
-        add(z, "top.txt", b"root file\n")
-
-    return zpath, members
+def _rel_from_out(out_dir: Path, extract_subdir: str, abs_path: str) -> str:
+    # extracted paths are always os.path.join(out_dir/extract_subdir, member): strip the prefix
+    return abs_path[len(str(out_dir / extract_subdir)) + 1:].replace(os.sep, "/")
 
 
 def _corrupt_first_occurrence(zip_path: Path, marker: bytes) -> None:
-    ba = bytearray(zip_path.read_bytes())
-    idx = ba.find(marker)
-    assert idx != -1, "marker not found in zip; ensure compress_type=ZIP_STORED"
-    ba[idx] ^= 0xFF  # flip one byte
-    zip_path.write_bytes(bytes(ba))
-
-
-def make_zip_with_corrupted_member(tmp_path: Path) -> Path:
-    zpath = tmp_path / "corrupt.zip"
-    with zipfile.ZipFile(zpath, "w") as z:
-        z.writestr("ok.txt", b"all good\n", compress_type=zipfile.ZIP_STORED)
-        z.writestr("corrupt/bad.txt", b"this will fail crc\n", compress_type=zipfile.ZIP_STORED)
-    # Corrupt the second file's data (ZIP_STORED -> plaintext in archive)
-    _corrupt_first_occurrence(zpath, b"this will fail crc\n")
-    return zpath
+    # flip the byte in place through a writable mapping: no copy of the archive
+    with open(zip_path, "r+b") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_WRITE) as mm:
+        idx = mm.find(marker)
+        assert idx != -1, "marker not found in zip; ensure compress_type=ZIP_STORED"
+        mm[idx] ^= 0xFF  # flip one byte
 
 
 # ---------------------- navigation / edge cases ----------------------
 
-def test_navigation_edgecases_medium(tmp_path):
+def test_navigation_edgecases_medium(make_medium_zip, tmp_path):
     """
     Navigation over a medium zip:
     - ls() shows directories with trailing "/"
@@ -78,7 +39,7 @@ def test_navigation_edgecases_medium(tmp_path):
     - cd() on a non-existent path -> FileNotFoundError
     - cd("..") from root -> ValueError (escape protection)
     """
-    zf, members = make_medium_zip(tmp_path)
+    zf, members = make_medium_zip()
     with ZipNavigator(str(zf)) as zn:
         root = zn.ls()
         # must include some top-level dirs with '/'
@@ -116,20 +77,19 @@ def test_navigation_edgecases_medium(tmp_path):
 
 # ---------------------- full iteration tests ----------------------
 
-def test_iterates_all_files_medium(tmp_path):
+def test_iterates_all_files_medium(make_medium_zip, outdir):
     """
     Iterate over a medium zip with .txt/.md filter:
     - Covers all expected files across multiple batches (order shuffled via seed)
     - No duplicates
     - Final status reports remaining=0
     """
-    zf, members = make_medium_zip(tmp_path)
-    expected = {m for m in members if posixpath.splitext(m)[1].lower() in {".txt", ".md"}}
-    out_dir = tmp_path / "out"; out_dir.mkdir()
+    zf, members = make_medium_zip()
+    expected = {m for m in members if m.lower().endswith(_TEXT_EXTS)}
 
     with ZipNavigator(str(zf)) as zn:
         zn.initialize_iterator(
-            output_dir=str(out_dir),
+            output_dir=str(outdir),
             batch_size=7,                    # small batches to force multiple steps
             extract_subdir="extracted_zip",
             seed=123,
@@ -143,12 +103,10 @@ def test_iterates_all_files_medium(tmp_path):
         total = 0
         for batch_paths in zn:
             total += len(batch_paths)
-            for p in batch_paths:
-                # map to path inside the archive
-                rel = os.path.relpath(p, str(out_dir / "extracted_zip")).replace(os.sep, "/")
-                seen_rel.add(posixpath.normpath(rel))
-                # each extracted file must exist
-                assert os.path.isfile(p)
+            # each extracted file must exist (checked per batch: the next one clears the folder)
+            assert all(map(os.path.isfile, batch_paths))
+            # map to path inside the archive
+            seen_rel.update([_rel_from_out(outdir, "extracted_zip", p) for p in batch_paths])
 
         # iterated all .txt/.md
         assert total == len(expected)
@@ -158,46 +116,38 @@ def test_iterates_all_files_medium(tmp_path):
         assert st["remaining"] == 0
 
 
-def test_resume_after_interrupt_medium(tmp_path):
+def test_resume_after_interrupt_medium(make_medium_zip, outdir):
     """
     Simulate process interruption:
     - 1st instance: initialize and consume 1 batch
     - 2nd instance: resume_iterator and consume the rest
     - End: extracted files (union of batches) == expected
     """
-    zf, members = make_medium_zip(tmp_path)
-    expected = {m for m in members if posixpath.splitext(m)[1].lower() in {".txt", ".md"}}
-    out_dir = tmp_path / "out_resume"; out_dir.mkdir()
+    zf, members = make_medium_zip()
+    expected = {m for m in members if m.lower().endswith(_TEXT_EXTS)}
 
     # First "session": one batch
     with ZipNavigator(str(zf)) as zn:
         zn.initialize_iterator(
-            output_dir=str(out_dir),
+            output_dir=str(outdir),
             batch_size=5,
             extract_subdir="extracted_zip",
             seed=42,
             extensions=[".txt", ".md"],
             on_error="skip",
             max_retries=0,
-            validate_crc=True,
+            validate_crc=False,
         )
 
         first_batch = next(zn)
         assert len(first_batch) > 0
         # map first batch paths to internal zip paths
-        first_seen = set()
-        for p in first_batch:
-            rel = os.path.relpath(p, str(out_dir / "extracted_zip")).replace(os.sep, "/")
-            first_seen.add(posixpath.normpath(rel))
+        first_seen = {_rel_from_out(outdir, "extracted_zip", p) for p in first_batch}
 
     # Second "session": resume and complete
-    seen_rel = set()
     with ZipNavigator(str(zf)) as zn2:
-        zn2.resume_iterator(output_dir=str(out_dir), extract_subdir="extracted_zip")
-        for batch_paths in zn2:
-            for p in batch_paths:
-                rel = os.path.relpath(p, str(out_dir / "extracted_zip")).replace(os.sep, "/")
-                seen_rel.add(posixpath.normpath(rel))
+        zn2.resume_iterator(output_dir=str(outdir), extract_subdir="extracted_zip")
+        seen_rel = {_rel_from_out(outdir, "extracted_zip", p) for batch_paths in zn2 for p in batch_paths}
 
         st = zn2.iterator_status()
         assert st["remaining"] == 0
@@ -209,17 +159,16 @@ def test_resume_after_interrupt_medium(tmp_path):
 
 # ---------------------- iterator edge cases ----------------------
 
-def test_iterator_no_matches_raises(tmp_path):
+def test_iterator_no_matches_raises(make_medium_zip, outdir):
     """
     Extension filter that yields nothing -> initialize_iterator must raise RuntimeError.
     """
-    zf, _ = make_medium_zip(tmp_path)
-    out_dir = tmp_path / "out3"; out_dir.mkdir()
+    zf, _ = make_medium_zip()
 
     with ZipNavigator(str(zf)) as zn:
         with pytest.raises(RuntimeError, match="No files found"):
             zn.initialize_iterator(
-                output_dir=str(out_dir),
+                output_dir=str(outdir),
                 batch_size=3,
                 extract_subdir="extracted_zip",
                 seed=1,
@@ -229,18 +178,17 @@ def test_iterator_no_matches_raises(tmp_path):
 
 # ---------------------- corrupted member handling ----------------------
 
-def test_corrupted_member_on_error_skip(tmp_path):
+def test_corrupted_member_on_error_skip(make_zip_with_corrupted_member, outdir):
     """
     ZIP with one corrupted file:
     - with on_error="skip" and validate_crc=True, extraction continues
     - the corrupted file is recorded in 'failed'
     """
-    zf = make_zip_with_corrupted_member(tmp_path)
-    out_dir = tmp_path / "out_corrupt"; out_dir.mkdir()
+    zf = make_zip_with_corrupted_member()
 
     with ZipNavigator(str(zf)) as zn:
         zn.initialize_iterator(
-            output_dir=str(out_dir),
+            output_dir=str(outdir),
             batch_size=10,
             extract_subdir="extracted_zip",
             seed=0,
@@ -261,7 +209,7 @@ def test_corrupted_member_on_error_skip(tmp_path):
         assert any("corrupt/bad.txt" in x for x in st["failed_tail"])
 
 
-def test_corrupted_member_on_error_abort(tmp_path):
+def test_corrupted_member_on_error_abort(tmp_path, outdir):
     """
     ZIP with only a corrupted file:
     - with on_error="abort" the first batch raises.
@@ -271,10 +219,9 @@ def test_corrupted_member_on_error_abort(tmp_path):
         z.writestr("bad.txt", b"boom\n", compress_type=zipfile.ZIP_STORED)
     _corrupt_first_occurrence(zpath, b"boom\n")
 
-    out_dir = tmp_path / "out_abort"; out_dir.mkdir()
     with ZipNavigator(str(zpath)) as zn:
         zn.initialize_iterator(
-            output_dir=str(out_dir),
+            output_dir=str(outdir),
             batch_size=1,
             extract_subdir="extracted_zip",
             seed=0,